@@ -1,16 +1,31 @@
 """
 Script to analyze trading simulation results and generate a comprehensive report
 """
+import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from datetime import datetime
 
-def analyze_simulation_results(file_path='simulation_results.csv'):
-    """Analyze trading simulation results and generate visualizations"""
+def analyze_simulation_results(file_path=None):
+    """
+    Analyze trading simulation results and generate visualizations
+
+    Args:
+        file_path: Results file (.parquet or .csv); defaults to the simulation's
+            Parquet export, or its CSV fallback when no Parquet file exists
+    """
     try:
+        if file_path is None:
+            file_path = 'simulation_results.parquet'
+            if not os.path.exists(file_path):
+                file_path = 'simulation_results.csv'
+
         # Read simulation results
-        df = pd.read_csv(file_path)
+        if file_path.endswith('.parquet'):
+            df = pd.read_parquet(file_path)
+        else:
+            df = pd.read_csv(file_path)
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         
         # Basic statistics
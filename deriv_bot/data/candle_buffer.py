@@ -0,0 +1,131 @@
+"""
+Candle Buffer Module
+
+Location: deriv_bot/data/candle_buffer.py
+
+Purpose:
+Fixed-capacity ring buffer for a live candle window. Prices are stored as
+one contiguous float32 row per OHLC field (structure of arrays), so updates
+from the candle stream write scalars in place instead of rebuilding a
+DataFrame for every message.
+
+Dependencies:
+- numpy: Preallocated price and epoch arrays
+- pandas: DataFrame view for feature engineering
+
+Interactions:
+- Input: Bootstrap DataFrame and streamed OHLC updates
+- Output: Latest close and chronological DataFrame snapshots
+- Relations: Backs DataFetcher.subscribe_candles / get_live_candles
+
+Author: Trading Bot Team
+Last modified: 2025-02-27
+"""
+import numpy as np
+import pandas as pd
+
+class CandleBuffer:
+    COLUMNS = ('open', 'high', 'low', 'close')
+
+    def __init__(self, capacity=500):
+        """
+        Initialize an empty buffer
+
+        Args:
+            capacity: Number of candles kept; older candles are overwritten
+        """
+        self.capacity = capacity
+        self.prices = np.empty((len(self.COLUMNS), capacity), dtype=np.float32)
+        self.epochs = np.empty(capacity, dtype=np.int64)
+        self.write_idx = 0  # Slot the next new candle is written to
+        self.size = 0
+        self.updated_epoch = None  # Market time of the latest price in the buffer
+
+    def __len__(self):
+        return self.size
+
+    @classmethod
+    def from_dataframe(cls, df, capacity=None):
+        """
+        Create a buffer holding the candles of a DataFrame
+
+        Args:
+            df: DataFrame with a DatetimeIndex and OHLC columns
+            capacity: Buffer capacity, defaults to len(df)
+
+        Returns:
+            CandleBuffer with the trailing candles of df
+        """
+        buffer = cls(capacity or len(df))
+        n = min(len(df), buffer.capacity)
+        for row, column in enumerate(cls.COLUMNS):
+            buffer.prices[row, :n] = df[column].to_numpy()[-n:]
+        buffer.epochs[:n] = df.index[-n:].asi8 // 10**9
+        buffer.size = n
+        buffer.write_idx = n % buffer.capacity
+        buffer.updated_epoch = buffer.last_epoch
+        return buffer
+
+    @property
+    def last_epoch(self):
+        """Open time of the newest candle, or None when empty"""
+        return int(self.epochs[self.write_idx - 1]) if self.size else None
+
+    @property
+    def last_close(self):
+        """Close of the newest candle, or None when empty"""
+        return float(self.prices[3, self.write_idx - 1]) if self.size else None
+
+    def update(self, open_time, open_, high, low, close, epoch=None):
+        """
+        Apply one OHLC update
+
+        An update for the newest candle overwrites it in place; an update for a
+        later candle is appended, replacing the oldest once the buffer is full.
+        Updates for older candles are ignored.
+
+        Args:
+            open_time: Candle open time as epoch seconds
+            open_, high, low, close: Candle prices
+            epoch: Time of the tick behind the update, defaults to open_time
+
+        Returns:
+            True if the buffer changed
+        """
+        open_time = int(open_time)
+        last_epoch = self.last_epoch
+        if last_epoch is not None and open_time < last_epoch:
+            return False
+
+        if last_epoch is not None and open_time == last_epoch:
+            slot = self.write_idx - 1
+        else:
+            slot = self.write_idx
+            self.write_idx = (self.write_idx + 1) % self.capacity
+            self.size = min(self.size + 1, self.capacity)
+
+        self.prices[:, slot] = (open_, high, low, close)
+        self.epochs[slot] = open_time
+        self.updated_epoch = int(epoch) if epoch is not None else open_time
+        return True
+
+    def to_dataframe(self):
+        """
+        Build a chronological DataFrame of the buffered candles
+
+        Returns:
+            New DataFrame indexed by candle time with float32 OHLC columns;
+            callers may modify it freely
+        """
+        if self.size < self.capacity:
+            order = np.arange(self.size)
+        else:
+            order = np.arange(self.write_idx, self.write_idx + self.capacity) % self.capacity
+
+        prices = self.prices[:, order]  # Fancy indexing copies, detaching the frame from the buffer
+        df = pd.DataFrame(
+            {column: prices[row] for row, column in enumerate(self.COLUMNS)},
+            index=pd.to_datetime(self.epochs[order], unit='s')
+        )
+        df.index.name = 'time'
+        return df
@@ -0,0 +1,138 @@
+"""
+Candle Cache Module
+
+Location: deriv_bot/data/candle_cache.py
+
+Purpose:
+Disk-backed TTL cache for historical candle DataFrames, so repeated runs
+can skip API round trips for data that was fetched recently.
+
+Dependencies:
+- pandas: Cached DataFrames
+- deriv_bot.monitor.logger: Logging functionality
+
+Interactions:
+- Input: Symbol, interval, count and a fetch coroutine
+- Output: Cached or freshly fetched DataFrames
+- Relations: Wraps DataFetcher.fetch_historical_data
+
+Author: Trading Bot Team
+Last modified: 2025-02-27
+"""
+import os
+import glob
+import gzip
+import pickle
+import time
+from deriv_bot.monitor.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+class FileCache:
+    def __init__(self, cache_dir=".cache"):
+        """
+        Initialize file cache
+
+        Args:
+            cache_dir: Root directory for cached candle files
+        """
+        self.cache_dir = cache_dir
+
+    def _entry_dir(self, symbol, interval):
+        return os.path.join(self.cache_dir, symbol, str(interval))
+
+    def _entry_path(self, symbol, interval, count, end_bucket):
+        return os.path.join(self._entry_dir(symbol, interval), f"{end_bucket}_{count}.pkl.gz")
+
+    def _entries(self, symbol, interval, count):
+        """Return (end_bucket, path) pairs for a symbol/interval/count, newest first"""
+        pattern = os.path.join(self._entry_dir(symbol, interval), f"*_{count}.pkl.gz")
+        entries = []
+        for path in glob.glob(pattern):
+            try:
+                end_bucket = int(os.path.basename(path).split('_')[0])
+            except ValueError:
+                continue
+            entries.append((end_bucket, path))
+        entries.sort(reverse=True)
+        return entries
+
+    def get(self, symbol, interval, count, ttl):
+        """
+        Get cached candles if the newest entry is younger than ttl
+
+        Entries are keyed by the candle bucket (epoch // interval) they were
+        fetched in, so ages are measured in whole candles.
+
+        Args:
+            symbol: Trading symbol
+            interval: Candle interval in seconds
+            count: Number of candles requested
+            ttl: Maximum age in seconds
+
+        Returns:
+            Cached DataFrame or None on miss
+        """
+        entries = self._entries(symbol, interval, count)
+        if not entries:
+            return None
+
+        end_bucket, path = entries[0]
+        current_bucket = int(time.time()) // interval
+        if (current_bucket - end_bucket) * interval >= ttl:
+            return None
+
+        try:
+            with gzip.open(path, 'rb') as f:
+                df = pickle.load(f)
+            logger.debug(f"Candle cache hit for {symbol} ({interval}s, {count} candles)")
+            return df
+        except Exception as e:
+            logger.warning(f"Failed to read candle cache {path}: {str(e)}")
+            return None
+
+    def put(self, symbol, interval, count, df):
+        """
+        Store candles for the current bucket and drop older entries
+
+        Args:
+            symbol: Trading symbol
+            interval: Candle interval in seconds
+            count: Number of candles requested
+            df: DataFrame to cache
+        """
+        end_bucket = int(time.time()) // interval
+        path = self._entry_path(symbol, interval, count, end_bucket)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(path, 'wb') as f:
+                pickle.dump(df, f)
+
+            for bucket, old_path in self._entries(symbol, interval, count):
+                if bucket != end_bucket:
+                    os.remove(old_path)
+        except Exception as e:
+            logger.warning(f"Failed to write candle cache {path}: {str(e)}")
+
+    async def get_or_fetch(self, fetch, symbol, interval, count, ttl):
+        """
+        Return cached candles or fetch and cache them
+
+        Args:
+            fetch: Coroutine function called as fetch(symbol, interval=..., count=...)
+            symbol: Trading symbol
+            interval: Candle interval in seconds
+            count: Number of candles to request
+            ttl: Maximum age of a cached entry in seconds
+
+        Returns:
+            DataFrame with candles or None if the fetch failed
+        """
+        df = self.get(symbol, interval, count, ttl)
+        if df is not None:
+            return df
+
+        df = await fetch(symbol, interval=interval, count=count)
+        if df is not None:
+            self.put(symbol, interval, count, df)
+        return df
@@ -0,0 +1,78 @@
+"""
+Connector Pool Module
+
+Location: deriv_bot/data/connector_pool.py
+
+Purpose:
+Provides a process-wide shared DerivConnector so scripts that run in the
+same event loop reuse one authorized WebSocket instead of each opening
+(and tearing down) their own.
+
+Dependencies:
+- asyncio: Lock guarding connector creation
+- deriv_bot.data.deriv_connector: Connector being shared
+- deriv_bot.monitor.logger: Logging functionality
+
+Interactions:
+- Input: Optional Config for the first connection
+- Output: Connected DerivConnector instance
+- Relations: Used by test_api_connectivity and test_trading_loop
+
+Author: Trading Bot Team
+Last modified: 2025-02-27
+"""
+import asyncio
+from deriv_bot.data.deriv_connector import DerivConnector
+from deriv_bot.monitor.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_shared = None
+_shared_loop = None
+_lock = None
+
+async def get_shared_connector(config=None):
+    """
+    Get the shared connector, creating or reconnecting it as needed
+
+    The connector is bound to the running event loop; a new loop (e.g. a
+    second asyncio.run) gets a fresh connector since WebSockets cannot move
+    between loops. config is only used when the connector is created.
+
+    Args:
+        config: Optional Config used for a newly created connector
+
+    Returns:
+        Connected DerivConnector or None if the connection failed
+    """
+    global _shared, _shared_loop, _lock
+
+    loop = asyncio.get_running_loop()
+    if _shared_loop is not loop:
+        _shared = None
+        _shared_loop = loop
+        _lock = asyncio.Lock()
+
+    async with _lock:
+        if _shared is None:
+            _shared = DerivConnector(config)
+
+        if not _shared.is_connected:
+            if not await _shared.connect():
+                logger.error("Failed to connect shared connector")
+                return None
+            logger.info("Shared connector connected")
+
+        return _shared
+
+async def close_shared_connector():
+    """Close and forget the shared connector, if any"""
+    global _shared
+
+    if _lock is None or _shared_loop is not asyncio.get_running_loop():
+        return
+
+    async with _lock:
+        if _shared is not None:
+            await _shared.close()
+            _shared = None
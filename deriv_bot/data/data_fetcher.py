@@ -23,8 +23,10 @@ Last modified: 2025-02-27
 import pandas as pd
 import numpy as np
 import asyncio
+import math
 import time
 import sys  # Added for memory size calculations
+from deriv_bot.data.candle_buffer import CandleBuffer
 from deriv_bot.monitor.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -36,6 +38,10 @@ class DataFetcher:
         self.fetch_cooldown = 10   # Minimum time between requests for the same symbol
         self.cache = {}            # Simple cache of data by symbol and interval
         self.cache_expiry = 3600   # Cache expiry in seconds (1 hour default)
+        self._empty_cache = {}     # (symbol, interval, count) -> time of last empty result
+        self.empty_result_ttl = 30 # Seconds to remember an empty result before querying again
+        self._live_candles = {}    # (symbol, interval) -> CandleBuffer kept current by OHLC updates
+        self._live_sockets = {}    # (symbol, interval) -> WebSocket the candle subscription was made on
 
     async def check_trading_enabled(self, symbol):
         """
@@ -101,6 +107,22 @@ class DataFetcher:
         Returns:
             DataFrame with historical data or None if failed
         """
+        # Fail fast if the same query came back empty moments ago (e.g. market closed)
+        empty_key = (symbol, interval, count)
+        empty_since = self._empty_cache.get(empty_key)
+        if empty_since is not None and time.monotonic() - empty_since < self.empty_result_ttl:
+            logger.debug(f"Skipping fetch for {symbol}: no data returned {time.monotonic() - empty_since:.1f}s ago")
+            return None
+
+        df = await self._fetch_historical_data(symbol, interval, count, retry_attempts, use_cache)
+        if df is None:
+            self._empty_cache[empty_key] = time.monotonic()
+        else:
+            self._empty_cache.pop(empty_key, None)
+        return df
+
+    async def _fetch_historical_data(self, symbol, interval, count, retry_attempts, use_cache):
+        """Fetch historical data from the API, see fetch_historical_data"""
         # First check connection availability
         if not await self.connector.check_connection():
             logger.warning("Connection not available, attempting to reconnect...")
@@ -196,21 +218,7 @@ class DataFetcher:
                         await asyncio.sleep(2)
                         continue
 
-                # Create DataFrame
-                df = pd.DataFrame([{
-                    'time': candle['epoch'],
-                    'open': float(candle['open']),
-                    'high': float(candle['high']),
-                    'low': float(candle['low']),
-                    'close': float(candle['close'])
-                } for candle in candles])
-
-                # Convert timestamp and set index
-                df['time'] = pd.to_datetime(df['time'], unit='s')
-                df.set_index('time', inplace=True)
-
-                # Sort index to ensure chronological order
-                df.sort_index(inplace=True)
+                df = self._candles_to_dataframe(candles)
 
                 # Save to cache
                 self.cache[cache_key] = df
@@ -231,6 +239,285 @@ class DataFetcher:
 
         return None
 
+    def _candles_to_dataframe(self, candles):
+        """
+        Convert raw API candles into a chronologically sorted DataFrame
+
+        Args:
+            candles: List of candle dicts from a ticks_history response
+
+        Returns:
+            DataFrame indexed by candle time with float32 OHLC columns
+        """
+        # Build float32 columns directly; prices need far less than float64
+        # precision and the model consumes float32 anyway
+        n = len(candles)
+        df = pd.DataFrame({
+            column: np.fromiter((float(candle[column]) for candle in candles), dtype=np.float32, count=n)
+            for column in ('open', 'high', 'low', 'close')
+        }, index=pd.to_datetime([candle['epoch'] for candle in candles], unit='s'))
+        df.index.name = 'time'
+
+        # Sort index to ensure chronological order
+        df.sort_index(inplace=True)
+        return df
+
+    async def fetch_historical_range(self, symbol, interval, start, end, retry_attempts=3):
+        """
+        Fetch candles for an explicit time window
+
+        Unlike fetch_historical_data this does not check trading availability or
+        apply the per-symbol cooldown, so several windows can be requested
+        back-to-back when assembling a larger history.
+
+        Args:
+            symbol: Trading symbol
+            interval: Candle interval in seconds
+            start: Window start as epoch seconds
+            end: Window end as epoch seconds
+
+        Returns:
+            DataFrame with the candles in the window (possibly empty) or None if failed
+        """
+        for attempt in range(retry_attempts):
+            try:
+                request = {
+                    "ticks_history": symbol,
+                    "start": int(start),
+                    "end": int(end),
+                    "count": min(max(1, int((end - start) // interval)), 5000),
+                    "granularity": interval,
+                    "style": "candles",
+                    "req_id": self.connector._get_request_id()
+                }
+
+                response = await self.connector.send_request(request)
+
+                if not response or "error" in response:
+                    error_msg = response["error"]["message"] if response else "No response"
+                    logger.warning(f"Error fetching {symbol} range {start}-{end}: {error_msg}")
+                    if attempt < retry_attempts - 1:
+                        await asyncio.sleep(2 * (attempt + 1))
+                    continue
+
+                candles = response.get("candles", [])
+                if not candles:
+                    return pd.DataFrame(columns=['open', 'high', 'low', 'close'])
+
+                return self._candles_to_dataframe(candles)
+
+            except Exception as e:
+                logger.error(f"Error in fetch_historical_range: {str(e)}")
+                if attempt < retry_attempts - 1:
+                    await asyncio.sleep(2 * (attempt + 1))
+
+        return None
+
+    async def subscribe_candles(self, symbol, interval=60, count=500):
+        """
+        Bootstrap a candle window and subscribe to its live OHLC updates
+
+        After this, get_live_candles keeps the window current from the update
+        stream instead of refetching the whole history every iteration.
+
+        Args:
+            symbol: Trading symbol
+            interval: Candle interval in seconds
+            count: Number of candles to keep in the window
+
+        Returns:
+            DataFrame with the initial candles or None if the subscription failed
+        """
+        try:
+            self.connector.get_ohlc_queue(symbol, interval)
+            request = {
+                "ticks_history": symbol,
+                "adjust_start_time": 1,
+                "count": count,
+                "end": "latest",
+                "granularity": interval,
+                "style": "candles",
+                "subscribe": 1,
+                "req_id": self.connector._get_request_id()
+            }
+            response = await self.connector.send_request(request)
+
+            if not response or "error" in response or not response.get("candles"):
+                error_msg = response["error"]["message"] if response and "error" in response else "No candles"
+                logger.error(f"Error subscribing to {symbol} candles: {error_msg}")
+                return None
+
+            df = self._candles_to_dataframe(response["candles"])
+            self._live_candles[(symbol, interval)] = CandleBuffer.from_dataframe(df)
+            self._live_sockets[(symbol, interval)] = self.connector.websocket
+            logger.info(f"Subscribed to {symbol} candles with {len(df)} candle window")
+            return df
+
+        except Exception as e:
+            logger.error(f"Error in subscribe_candles: {str(e)}")
+            return None
+
+    def is_subscribed(self, symbol, interval=60):
+        """
+        Check whether a candle subscription is still streaming
+
+        A subscription only lives as long as the connection it was made on; after
+        a reconnect it has to be made again. Until then, a quiet stream (e.g. a
+        closed market) is still subscribed and must not be subscribed twice,
+        which the API rejects.
+
+        Args:
+            symbol: Trading symbol passed to subscribe_candles
+            interval: Candle interval in seconds
+
+        Returns:
+            True if subscribed on the current open connection
+        """
+        socket = self._live_sockets.get((symbol, interval))
+        return socket is not None and socket is self.connector.websocket and self.connector.is_connected
+
+    async def get_live_candles(self, symbol, interval=60, timeout=30):
+        """
+        Apply the next OHLC updates to a subscribed candle window
+
+        Waits for at least one update, then writes it into the window's ring
+        buffer: the forming candle is updated in place and a new candle
+        overwrites the oldest one.
+
+        Args:
+            symbol: Trading symbol passed to subscribe_candles
+            interval: Candle interval in seconds
+            timeout: Seconds to wait for an update
+
+        Returns:
+            New DataFrame of the updated window (callers may modify it) or None
+            if not subscribed or no update arrived
+        """
+        buffer = self._live_candles.get((symbol, interval))
+        if buffer is None:
+            return None
+
+        updates = await self.connector.wait_for_ohlc(symbol, interval, timeout=timeout)
+        if not updates:
+            return None
+
+        for ohlc in updates:
+            buffer.update(
+                ohlc['open_time'],
+                float(ohlc['open']),
+                float(ohlc['high']),
+                float(ohlc['low']),
+                float(ohlc['close']),
+                epoch=ohlc.get('epoch')
+            )
+
+        return buffer.to_dataframe()
+
+    def get_live_quote(self, symbol, interval=60):
+        """
+        Get the latest price of a subscribed candle window without building a DataFrame
+
+        Args:
+            symbol: Trading symbol passed to subscribe_candles
+            interval: Candle interval in seconds
+
+        Returns:
+            (epoch, price) of the latest update or None if not subscribed
+        """
+        buffer = self._live_candles.get((symbol, interval))
+        if buffer is None or not len(buffer):
+            return None
+        return buffer.updated_epoch, buffer.last_close
+
+    async def fetch_historical_data_chunked(self, symbol, interval, count, chunk=200, max_concurrent=4):
+        """
+        Fetch recent history as concurrent fixed-size time windows
+
+        Splits the last count candles into windows of chunk candles, fetches them
+        with fetch_historical_range and merges the results, so no single request
+        has to carry the whole history.
+
+        Args:
+            symbol: Trading symbol
+            interval: Candle interval in seconds
+            count: Number of candles wanted
+            chunk: Candles per window
+            max_concurrent: Maximum windows in flight at once
+
+        Returns:
+            DataFrame with the combined candles or None if any window failed
+        """
+        end = int(time.time()) // interval * interval
+        span = chunk * interval
+        ranges = [(end - (i + 1) * span, end - i * span) for i in range(math.ceil(count / chunk))]
+
+        # Respect the API's per-connection concurrency limit
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def fetch_window(start, stop):
+            async with semaphore:
+                start_req = time.perf_counter()
+                df = await self.fetch_historical_range(symbol, interval, start, stop)
+                logger.debug(f"Chunk {start}-{stop} for {symbol}: "
+                             f"{'failed' if df is None else f'{len(df)} candles'} in {time.perf_counter() - start_req:.2f}s")
+                return df
+
+        chunks = await asyncio.gather(*(fetch_window(start, stop) for start, stop in ranges))
+        if any(df is None for df in chunks):
+            return None
+
+        frames = [df for df in chunks if not df.empty]
+        if not frames:
+            return None
+
+        data = pd.concat(frames).sort_index()
+        return data[~data.index.duplicated(keep='last')]
+
+    async def fetch_historical_data_batch(self, requests):
+        """
+        Fetch historical candles for several symbol/interval/count requests at once
+
+        The requests are pipelined over the connection in a single round trip
+        and matched to their responses by req_id.
+
+        Args:
+            requests: List of dicts with 'symbol', 'interval' and optional 'count' (default 1000)
+
+        Returns:
+            List of DataFrames in request order, None for requests that failed
+        """
+        if not await self.connector.check_connection():
+            logger.warning("Connection not available, attempting to reconnect...")
+            if not await self.connector.reconnect():
+                logger.error("Failed to establish connection")
+                return [None] * len(requests)
+
+        payloads = [{
+            "ticks_history": request['symbol'],
+            "adjust_start_time": 1,
+            "count": request.get('count', 1000),
+            "end": "latest",
+            "granularity": request['interval'],
+            "style": "candles",
+            "req_id": self.connector._get_request_id()
+        } for request in requests]
+
+        responses = await self.connector.send_requests(payloads)
+
+        results = []
+        for request, response in zip(requests, responses):
+            if not response or "error" in response or not response.get("candles"):
+                logger.warning(f"Batch request for {request['symbol']} returned no candles")
+                results.append(None)
+                continue
+
+            df = self._candles_to_dataframe(response["candles"])
+            self.cache[f"{request['symbol']}_{request['interval']}"] = df
+            results.append(df)
+
+        logger.info(f"Batch fetched {sum(df is not None for df in results)}/{len(requests)} candle sets")
+        return results
+
     async def fetch_sufficient_data(self, symbol, interval, min_required_samples, max_attempts=3):
         """
         Ensures that sufficient samples are obtained for analysis
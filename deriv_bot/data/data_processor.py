@@ -1,6 +1,7 @@
 """
 Module for processing and preparing market data for ML model
 """
+import hashlib
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
@@ -26,14 +27,22 @@ class DataProcessor:
         self.absolute_min_data_points = 15  # Minimum to create at least a few valid sequences
         # Set a default for feature dimensions
         self.default_feature_dim = 46  # Expected by existing models
+        # Last prepare_data result, keyed on the input window and parameters
+        self._prepared_key = None
+        self._prepared = None
 
-    def prepare_data(self, df, sequence_length=30):
+    def prepare_data(self, df, sequence_length=30, scaler=None):
         """
         Prepare data for LSTM model using percentage returns
 
+        Calling again with the same window contents and parameters (e.g. training
+        several model types on one history) returns copies of the previous result
+        without redoing the work. The input DataFrame is not modified.
+
         Args:
             df: DataFrame with OHLCV data
             sequence_length: Number of time steps for LSTM input
+            scaler: Already fitted return scaler to reuse; fits self.return_scaler if None
 
         Returns:
             X: Input sequences, shape (samples, sequence_length, features)
@@ -45,6 +54,17 @@ class DataProcessor:
                 logger.error("Input DataFrame is None or empty")
                 return None, None, None
 
+            # Key on the full window contents (so revised or backfilled interior rows
+            # miss) and on the scaler object itself, which the key keeps alive
+            content_hash = hashlib.sha1(
+                pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes()
+            ).hexdigest()
+            cache_key = (content_hash, tuple(df.columns), sequence_length, scaler)
+            if self._prepared_key is not None and cache_key == self._prepared_key:
+                logger.info("Reusing prepared data for unchanged input window")
+                X, y, scaler = self._prepared
+                return X.copy(), y.copy(), scaler
+
             # Validate data length early to provide clear error message
             original_data_length = len(df)
             logger.info(f"Preparing data with shape: {df.shape}")
@@ -54,8 +74,9 @@ class DataProcessor:
                 logger.error(f"Insufficient data: {original_data_length} points available, absolute minimum required: {self.absolute_min_data_points}")
                 return None, None, None
 
-            # Calculate percentage returns for prediction target
-            df['returns'] = df['close'].pct_change()
+            # Calculate percentage returns for prediction target (on a new frame, so
+            # the caller's data is left untouched)
+            df = df.assign(returns=df['close'].pct_change())
 
             # Clip returns to realistic range for Forex
             df['returns'] = df['returns'].clip(-self.max_expected_return, self.max_expected_return)
@@ -78,10 +99,14 @@ class DataProcessor:
 
             logger.info(f"Data shape after indicators: {df.shape}")
 
-            # Scale returns first (target variable)
+            # Scale returns first (target variable); a supplied scaler only transforms
             returns_data = df['returns'].values.reshape(-1, 1)
-            scaled_returns = self.return_scaler.fit_transform(returns_data)
-            logger.info(f"Returns scaling params - Min: {self.return_scaler.data_min_}, Max: {self.return_scaler.data_max_}")
+            if scaler is None:
+                scaler = self.return_scaler
+                scaled_returns = scaler.fit_transform(returns_data)
+                logger.info(f"Returns scaling params - Min: {scaler.data_min_}, Max: {scaler.data_max_}")
+            else:
+                scaled_returns = scaler.transform(returns_data)
 
             # Adjust sequence length if needed based on available data
             # Ensure sequence_length is not None before passing it
@@ -118,7 +143,9 @@ class DataProcessor:
                 logger.info(f"Adjusted feature dimensions to match model expectations: {X.shape}")
 
             logger.info(f"Created sequences - X shape: {X.shape}, y shape: {y.shape}")
-            return X, y, self.return_scaler
+            self._prepared_key = cache_key
+            self._prepared = (X, y, scaler)
+            return X.copy(), y.copy(), scaler  # Callers own their arrays; the memo keeps its own
 
         except Exception as e:
             logger.error(f"Error in prepare_data: {str(e)}")
@@ -126,6 +153,64 @@ class DataProcessor:
             logger.error(traceback.format_exc())
             return None, None, None
 
+    def prepare_latest_sequence(self, df, sequence_length=30):
+        """
+        Build only the most recent input sequence for live prediction
+
+        Unlike prepare_data, this does not refit the return scaler or window the
+        whole history; indicators are computed once and only the trailing
+        sequence_length rows are turned into model input.
+
+        The input DataFrame is not modified.
+
+        Args:
+            df: DataFrame with OHLCV data (and engineered features)
+            sequence_length: Number of time steps for LSTM input
+
+        Returns:
+            Input sequence of shape (1, sequence_length, features) or None on failure
+        """
+        try:
+            if df is None or df.empty:
+                logger.error("Input DataFrame is None or empty")
+                return None
+
+            if len(df) < self.absolute_min_data_points:
+                logger.error(f"Insufficient data: {len(df)} points available, absolute minimum required: {self.absolute_min_data_points}")
+                return None
+
+            # Same cleaning as prepare_data so indicator windows line up with training;
+            # done on a new frame, since callers may pass a cached or shared one
+            df = df.assign(returns=df['close'].pct_change())
+            df['returns'] = df['returns'].clip(-self.max_expected_return, self.max_expected_return)
+            df.dropna(inplace=True)
+
+            df = self.add_technical_indicators(df)
+            if df is None or df.empty:
+                logger.error("Failed to calculate indicators for latest sequence")
+                return None
+
+            if sequence_length is None:
+                sequence_length = self.min_sequence_length
+
+            adjusted_sequence_length = self.get_optimal_sequence_length(len(df), sequence_length)
+            if adjusted_sequence_length is None:
+                logger.error(f"Could not determine a valid sequence length for {len(df)} data points")
+                return None
+
+            # Slice the trailing rows before converting, straight to float32
+            window = df.drop('returns', axis=1).iloc[-adjusted_sequence_length:].to_numpy(dtype=np.float32)
+            X = window.reshape(1, adjusted_sequence_length, window.shape[1])
+
+            if X.shape[2] != self.default_feature_dim:
+                X = self._pad_or_trim_features(X, self.default_feature_dim)
+
+            return X
+
+        except Exception as e:
+            logger.error(f"Error preparing latest sequence: {str(e)}")
+            return None
+
     def _pad_or_trim_features(self, X, target_dim):
         """
         Adjust feature dimension to match expected model input
@@ -149,7 +234,7 @@ class DataProcessor:
                 return X
 
             samples, seq_len, _ = X.shape
-            result = np.zeros((samples, seq_len, target_dim))
+            result = np.zeros((samples, seq_len, target_dim), dtype=X.dtype)
 
             if current_dim < target_dim:
                 # Pad with zeros
@@ -231,22 +316,24 @@ class DataProcessor:
                 logger.error(f"Insufficient data for calculating indicators: {original_length} points")
                 return None
 
+            close = df['close']
+
             # Moving averages - Use shorter windows for limited data
             sma_window = min(20, max(5, original_length // 10))
-            df['SMA_20'] = df['close'].rolling(window=sma_window).mean()
+            df['SMA_20'] = close.rolling(window=sma_window).mean()
 
             # Only add longer MA if we have enough data
             if original_length >= 50:
-                df['SMA_50'] = df['close'].rolling(window=50).mean()
+                df['SMA_50'] = close.rolling(window=50).mean()
             else:
                 # Use a shorter window as fallback
                 short_window = max(5, original_length // 8)
-                df['SMA_50'] = df['close'].rolling(window=short_window).mean()
+                df['SMA_50'] = close.rolling(window=short_window).mean()
                 logger.warning(f"Using shortened MA window ({short_window}) due to limited data")
 
             # RSI - Adapt window size based on available data
             rsi_window = min(14, max(5, original_length // 12))
-            delta = df['close'].diff()
+            delta = close.diff()
             gain = (delta.where(delta > 0, 0)).rolling(window=rsi_window).mean()
             loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_window).mean()
             # Avoid division by zero
@@ -256,18 +343,18 @@ class DataProcessor:
 
             # Momentum - Adapt period based on data length
             momentum_period = min(10, max(3, original_length // 15))
-            df['momentum'] = df['close'].pct_change(periods=momentum_period)
+            df['momentum'] = close.pct_change(periods=momentum_period)
 
             # Volatility - Adapt window based on data length
             vol_window = min(20, max(5, original_length // 10))
-            df['volatility'] = df['close'].pct_change().rolling(window=vol_window).std()
+            df['volatility'] = (delta / close.shift()).rolling(window=vol_window).std()  # pct_change from the diff above
 
             # Fill NaN values with forward fill, then backward fill for remaining NaNs
             # This is safer than dropping rows when data is limited
             df = df.fillna(method='ffill').fillna(method='bfill')
 
             # Only drop NaN values if we have enough data to spare
-            remaining_after_fill = df.dropna().shape[0]
+            remaining_after_fill = int(df.notna().all(axis=1).sum())  # Count without building a dropped copy
             if remaining_after_fill >= self.absolute_min_data_points:
                 df.dropna(inplace=True)
                 logger.info(f"Dropped NaN values, {df.shape[0]} rows remaining")
@@ -316,7 +403,8 @@ class DataProcessor:
 
             # Validate data
             if isinstance(data, pd.DataFrame):
-                data_array = data.values
+                # Convert straight to float32 rather than through a float64 copy of the frame
+                data_array = data.to_numpy(dtype=np.float32)
             else:
                 data_array = data
 
@@ -338,48 +426,25 @@ class DataProcessor:
 
             logger.info(f"Creating {num_sequences} sequences with length {sequence_length}")
 
-            # Create sequences
-            X = []
-            y = []
-
             # Validate returns shape and length match data length
             if len(returns) != original_data_length:
                 logger.error(f"Returns length ({len(returns)}) doesn't match data length ({original_data_length})")
                 return None, None
 
-            for i in range(num_sequences):
-                # If we're working with DataFrame, extract rows correctly
-                if isinstance(data, pd.DataFrame):
-                    sequence = data.iloc[i:(i + sequence_length)].values
-                else:
-                    sequence = data_array[i:(i + sequence_length)]
-
-                X.append(sequence)
-
-                # Extract the target value and ensure it's a scalar
-                try:
-                    if len(returns.shape) > 1:
-                        target_value = returns[i + sequence_length, 0]  # Extract scalar from 2D array
-                    else:
-                        target_value = returns[i + sequence_length]  # Already a scalar
-
-                    y.append(target_value)
-                except IndexError:
-                    logger.error(f"Index error accessing returns at position {i + sequence_length}")
-                    return None, None
-
-            # Check if we actually created any sequences
-            if len(X) == 0:
-                logger.error("No sequences could be created with current parameters")
-                return None, None
+            # Fresh arrays per call: callers hand X and y to training threads that
+            # may still be running when the next window is prepared
+            X = np.empty((num_sequences, sequence_length, data_array.shape[1]), dtype=np.float32)
+            y = np.empty(num_sequences, dtype=np.float32)
 
-            X = np.array(X)
-            y = np.array(y)
+            returns_array = np.asarray(returns)
+            if len(returns_array.shape) > 1:
+                returns_array = returns_array[:, 0]  # Extract scalars from 2D array
 
-            # Ensure y is 1D
-            if len(y.shape) > 1:
-                logger.warning(f"Target array has unexpected shape: {y.shape}, reshaping to 1D")
-                y = y.ravel()
+            # Zero-copy (windows, features, sequence_length) view of every window,
+            # copied into the contiguous array in one vectorized pass
+            windows = np.lib.stride_tricks.sliding_window_view(data_array, sequence_length, axis=0)
+            np.copyto(X, windows[:num_sequences].transpose(0, 2, 1), casting='unsafe')
+            y[:] = returns_array[sequence_length:sequence_length + num_sequences]
 
             # Log sequence statistics
             logger.info(f"Sequence stats - X shape: {X.shape}, y shape: {y.shape}")
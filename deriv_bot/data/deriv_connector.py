@@ -9,6 +9,7 @@ and provides low-level API communication functionality.
 
 Dependencies:
 - websockets: WebSocket client implementation
+- orjson (optional): Faster JSON encoding/decoding of API messages
 - deriv_bot.monitor.logger: Logging functionality
 - deriv_bot.utils.config: Configuration management
 
@@ -29,8 +30,24 @@ import websockets
 from deriv_bot.monitor.logger import setup_logger
 from deriv_bot.utils.config import Config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = setup_logger(__name__)
 
+# Every API message goes through these, so use orjson when it is installed
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj):
+        # orjson returns bytes; decode so requests still go out as text frames
+        return orjson.dumps(obj).decode()
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 class DerivConnector:
     def __init__(self, config=None):
         self.config = config or Config()
@@ -54,11 +71,19 @@ class DerivConnector:
         self.balance = None
         self.currency = None
         self.heartbeat_task = None
+        self.tick_queues = {}  # Newest tick per subscribed symbol
+        self.ohlc_queues = {}  # Newest candle update per (symbol, granularity)
+        self.pending_responses = {}  # req_id -> future awaiting that response
 
         # Log the environment we're connecting to
         env_mode = "REAL" if not self.config.is_demo() else "DEMO"
         logger.info(f"DerivConnector initialized in {env_mode} mode")
 
+    @property
+    def is_connected(self):
+        """Whether the WebSocket connection is currently open"""
+        return self.websocket is not None and not self.websocket.closed
+
     async def connect(self):
         """Establish WebSocket connection to Deriv API"""
         try:
@@ -387,72 +412,363 @@ class DerivConnector:
             return False
 
     async def send_request(self, request):
-        """Send request to Deriv API with mutex lock"""
+        """
+        Send request to Deriv API and wait for its response
+
+        Requests from concurrent tasks share the socket: each response is
+        matched to its request by req_id (assigned here if missing), so one
+        request's round trip does not hold up another's.
+        """
         if not self.websocket:
             logger.error("WebSocket connection not established")
             return None
 
-        async with self.lock:  # Ensure only one request at a time
-            try:
-                # Add basic retry for message sending
-                for attempt in range(3):  # 3 attempts maximum
-                    try:
-                        if self.websocket.closed:
-                            logger.warning(f"WebSocket closed before sending request (attempt {attempt+1})")
-                            if attempt < 2:
-                                if attempt == 0:  # Only try to reconnect on first failure
-                                    await self.reconnect()
-                                await asyncio.sleep(2)  # Increased from 1s to 2s
-                                continue
-                            else:
-                                return None
-
-                        await self.websocket.send(json.dumps(request))
-                        response = await self.websocket.recv()
-                        parsed_response = json.loads(response)
-
-                        # Update last message time
-                        self.last_message_time = asyncio.get_event_loop().time()
-
-                        # Check for API errors
-                        if "error" in parsed_response:
-                            error_code = parsed_response["error"]["code"]
-                            error_message = parsed_response["error"]["message"]
-
-                            # Check for authentication errors
-                            if error_code in ["InvalidToken", "AuthorizationRequired"]:
-                                logger.error(f"Authentication error: {error_message}")
-                                self.authorized = False  # Mark as unauthorized
-                                # Force reconnect with fresh auth
-                                await self.reconnect()
-                            else:
-                                logger.warning(f"API error {error_code}: {error_message}")
-
-                        return parsed_response
+        if "req_id" not in request:
+            request["req_id"] = self._get_request_id()
+        req_id = request["req_id"]
 
-                    except websockets.exceptions.ConnectionClosed:
+        try:
+            # Add basic retry for message sending
+            for attempt in range(3):  # 3 attempts maximum
+                try:
+                    if self.websocket.closed:
+                        logger.warning(f"WebSocket closed before sending request (attempt {attempt+1})")
                         if attempt < 2:
-                            logger.warning(f"Connection closed while sending request. Attempt {attempt+1}/3")
-                            # Try to reconnect before retrying
                             if attempt == 0:  # Only try to reconnect on first failure
                                 await self.reconnect()
                             await asyncio.sleep(2)  # Increased from 1s to 2s
+                            continue
                         else:
-                            logger.error("Connection permanently closed after 3 attempts")
                             return None
 
-                    except Exception as e:
-                        logger.error(f"Error sending request (attempt {attempt+1}): {str(e)}")
-                        if attempt < 2:
-                            await asyncio.sleep(2)  # Increased from 1s to 2s
+                    response = asyncio.get_running_loop().create_future()
+                    self.pending_responses[req_id] = response
+                    try:
+                        await self.websocket.send(_json_dumps(request))
+                        parsed_response = await self._await_response(response)
+                    finally:
+                        self.pending_responses.pop(req_id, None)
+
+                    # Update last message time
+                    self.last_message_time = asyncio.get_event_loop().time()
+
+                    # Check for API errors
+                    if "error" in parsed_response:
+                        error_code = parsed_response["error"]["code"]
+                        error_message = parsed_response["error"]["message"]
+
+                        # Check for authentication errors
+                        if error_code in ["InvalidToken", "AuthorizationRequired"]:
+                            logger.error(f"Authentication error: {error_message}")
+                            self.authorized = False  # Mark as unauthorized
+                            # Force reconnect with fresh auth
+                            await self.reconnect()
                         else:
-                            return None
+                            logger.warning(f"API error {error_code}: {error_message}")
 
-                return None  # All attempts failed
+                    return parsed_response
 
-            except Exception as e:
-                logger.error(f"Fatal error sending request: {str(e)}")
+                except websockets.exceptions.ConnectionClosed:
+                    if attempt < 2:
+                        logger.warning(f"Connection closed while sending request. Attempt {attempt+1}/3")
+                        # Try to reconnect before retrying
+                        if attempt == 0:  # Only try to reconnect on first failure
+                            await self.reconnect()
+                        await asyncio.sleep(2)  # Increased from 1s to 2s
+                    else:
+                        logger.error("Connection permanently closed after 3 attempts")
+                        return None
+
+                except Exception as e:
+                    logger.error(f"Error sending request (attempt {attempt+1}): {str(e)}")
+                    if attempt < 2:
+                        await asyncio.sleep(2)  # Increased from 1s to 2s
+                    else:
+                        return None
+
+            return None  # All attempts failed
+
+        except Exception as e:
+            logger.error(f"Fatal error sending request: {str(e)}")
+            return None
+
+    async def send_requests(self, requests, timeout=30):
+        """
+        Send several requests back-to-back and collect their responses by req_id
+
+        All requests are written before any response is read, so the batch costs
+        one network round trip instead of one per request. Messages that do not
+        belong to the batch (e.g. subscription updates) are skipped.
+
+        Args:
+            requests: List of request dicts; a req_id is assigned if missing
+            timeout: Seconds to wait for all responses
+
+        Returns:
+            List of parsed responses in request order, None for missing ones
+        """
+        if not self.websocket:
+            logger.error("WebSocket connection not established")
+            return [None] * len(requests)
+
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for request in requests:
+            if "req_id" not in request:
+                request["req_id"] = self._get_request_id()
+            futures[request["req_id"]] = loop.create_future()
+        self.pending_responses.update(futures)
+
+        try:
+            for request in requests:
+                await self.websocket.send(_json_dumps(request))
+
+            async def collect():
+                for future in futures.values():
+                    message = await self._await_response(future)
+                    if "error" in message:
+                        logger.warning(f"API error {message['error'].get('code')}: "
+                                       f"{message['error'].get('message')}")
+
+            await asyncio.wait_for(collect(), timeout=timeout)
+            self.last_message_time = asyncio.get_event_loop().time()
+
+        except asyncio.TimeoutError:
+            received = sum(future.done() for future in futures.values())
+            logger.warning(f"Timed out waiting for batch responses: received {received}/{len(futures)}")
+        except Exception as e:
+            logger.error(f"Error sending request batch: {str(e)}")
+        finally:
+            for req_id in futures:
+                self.pending_responses.pop(req_id, None)
+
+        return [
+            futures[request["req_id"]].result() if futures[request["req_id"]].done() else None
+            for request in requests
+        ]
+
+    def _route_stream(self, message):
+        """
+        Queue a subscription update (tick or OHLC candle) for its consumer
+
+        Each tick and OHLC queue holds only the newest update; an unread older
+        one is discarded when a new one arrives, so a stream nobody is reading
+        any more cannot grow without bound.
+
+        Returns:
+            True if the message was a stream update, False otherwise
+        """
+        if not message:
+            return False
+
+        msg_type = message.get("msg_type")
+        if msg_type == "tick" and "tick" in message:
+            tick = message["tick"]
+            queue = self.tick_queues.get(tick.get("symbol"))
+            if queue is not None:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(tick)
+            return True
+
+        if msg_type == "ohlc" and "ohlc" in message:
+            ohlc = message["ohlc"]
+            queue = self.ohlc_queues.get((ohlc.get("symbol"), int(ohlc.get("granularity", 0))))
+            if queue is not None:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(ohlc)
+            return True
+
+        return False
+
+    def _dispatch(self, message):
+        """
+        Hand a received message to whoever is waiting for it
+
+        Responses resolve the future registered for their req_id; subscription
+        updates go to their stream queues. Whichever task is reading the socket
+        calls this for every message, so nothing it reads on behalf of another
+        task is lost.
+
+        Returns:
+            True if the message was claimed, False otherwise
+        """
+        if not message:
+            return False
+
+        future = self.pending_responses.pop(message.get("req_id"), None)
+        if future is not None:
+            if not future.done():
+                future.set_result(message)
+            return True
+
+        return self._route_stream(message)
+
+    async def _await_response(self, future):
+        """
+        Wait for a response future registered in pending_responses
+
+        Only one task reads the socket at a time (self.lock). If another task
+        is reading, its dispatch resolves the future and this returns without
+        ever taking the lock; otherwise this task takes over reading until its
+        own response arrives.
+
+        Args:
+            future: Future registered under the request's req_id
+
+        Returns:
+            Parsed response message
+        """
+        while not future.done():
+            acquire = asyncio.ensure_future(self.lock.acquire())
+            try:
+                await asyncio.wait({future, acquire}, return_when=asyncio.FIRST_COMPLETED)
+            except asyncio.CancelledError:
+                if acquire.done() and not acquire.cancelled():
+                    self.lock.release()
+                else:
+                    acquire.cancel()
+                raise
+
+            if not acquire.done():
+                acquire.cancel()  # Answered by the current reader
+                break
+
+            try:
+                while not future.done():
+                    message = _json_loads(await self.websocket.recv())
+                    if not self._dispatch(message):
+                        logger.debug(f"Dropping unexpected {message.get('msg_type')} message while waiting for a response")
+            finally:
+                self.lock.release()
+
+        return future.result()
+
+    def get_tick_queue(self, symbol):
+        """Get the newest-tick queue for a symbol, creating it if needed"""
+        if symbol not in self.tick_queues:
+            self.tick_queues[symbol] = asyncio.Queue(maxsize=1)
+        return self.tick_queues[symbol]
+
+    async def wait_for_tick(self, symbol, timeout=30, min_epoch=None):
+        """
+        Wait for the next tick of a subscribed symbol
+
+        Returns a tick already received while other requests were in flight,
+        otherwise reads the stream until one arrives.
+
+        Args:
+            symbol: Subscribed trading symbol
+            timeout: Seconds to wait before giving up
+            min_epoch: Skip ticks older than this epoch (e.g. ones buffered during a wait)
+
+        Returns:
+            Tick dict (epoch, quote, symbol, ...) or None on timeout or error
+        """
+        queue = self.get_tick_queue(symbol)
+
+        def take_tick():
+            tick = queue.get_nowait()
+            if min_epoch is not None and tick.get('epoch', 0) < min_epoch:
                 return None
+            return tick
+
+        if not queue.empty():
+            tick = take_tick()
+            if tick is not None:
+                return tick
+
+        if not self.websocket:
+            logger.error("WebSocket connection not established")
+            return None
+
+        async def read_until_tick():
+            async with self.lock:
+                while True:
+                    message = _json_loads(await self.websocket.recv())
+                    self.last_message_time = asyncio.get_event_loop().time()
+                    if not self._dispatch(message):
+                        logger.debug(f"Dropping unexpected {message.get('msg_type')} message while waiting for ticks")
+                    elif not queue.empty():
+                        tick = take_tick()
+                        if tick is not None:
+                            return tick
+
+        try:
+            return await asyncio.wait_for(read_until_tick(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"No tick received for {symbol} within {timeout}s")
+        except Exception as e:
+            logger.error(f"Error waiting for tick: {str(e)}")
+        return None
+
+    def get_ohlc_queue(self, symbol, granularity):
+        """Get the newest-candle-update queue for a symbol and granularity, creating it if needed"""
+        key = (symbol, int(granularity))
+        if key not in self.ohlc_queues:
+            self.ohlc_queues[key] = asyncio.Queue(maxsize=1)
+        return self.ohlc_queues[key]
+
+    async def wait_for_ohlc(self, symbol, granularity, timeout=30):
+        """
+        Get the newest candle update for a subscribed symbol and granularity
+
+        Returns the update received while other requests were in flight,
+        otherwise reads the stream until one arrives and then keeps reading
+        whatever the socket has already buffered, so a consumer that fell
+        behind catches up to the newest update in one call. Superseded updates
+        are dropped; a candle that closed unread keeps its last seen values.
+
+        Args:
+            symbol: Subscribed trading symbol
+            granularity: Candle interval in seconds
+            timeout: Seconds to wait before giving up
+
+        Returns:
+            List holding the newest OHLC dict (empty on timeout or error)
+        """
+        queue = self.get_ohlc_queue(symbol, granularity)
+
+        def drain():
+            updates = []
+            while not queue.empty():
+                updates.append(queue.get_nowait())
+            return updates
+
+        if not queue.empty():
+            return drain()
+
+        if not self.websocket:
+            logger.error("WebSocket connection not established")
+            return []
+
+        def route(message):
+            self.last_message_time = asyncio.get_event_loop().time()
+            if not self._dispatch(message):
+                logger.debug(f"Dropping unexpected {message.get('msg_type')} message while waiting for candles")
+
+        async def read_until_update():
+            async with self.lock:
+                while queue.empty():
+                    route(_json_loads(await self.websocket.recv()))
+
+                # Catch up on messages that are already waiting
+                while True:
+                    try:
+                        raw = await asyncio.wait_for(self.websocket.recv(), timeout=0.01)
+                    except asyncio.TimeoutError:
+                        break
+                    route(_json_loads(raw))
+            return drain()
+
+        try:
+            return await asyncio.wait_for(read_until_update(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"No candle update received for {symbol} within {timeout}s")
+        except Exception as e:
+            logger.error(f"Error waiting for candle updates: {str(e)}")
+        return []
 
     async def subscribe_to_ticks(self, symbol):
         """Subscribe to price ticks for a symbol"""
@@ -461,7 +777,10 @@ class DerivConnector:
             "subscribe": 1,
             "req_id": self._get_request_id()
         }
-        return await self.send_request(subscribe_req)
+        self.get_tick_queue(symbol)
+        response = await self.send_request(subscribe_req)
+        self._route_stream(response)
+        return response
 
     async def get_active_symbols(self):
         """Get list of active trading symbols"""
@@ -21,30 +21,25 @@ Interactions:
 Author: Trading Bot Team
 Last modified: 2024-02-26
 """
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
-def setup_logger(name):
-    """
-    Set up logger with both file and console handlers
-    
-    Args:
-        name: Logger name (usually __name__)
-    """
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    # Create formatters
+_log_queue = None
+_queue_listener = None
+
+def _create_handlers():
+    """Create the console and file handlers shared by all loggers"""
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
-    
+
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
+
     # Create file handler
     file_handler = RotatingFileHandler(
         'trading_bot.log',
@@ -52,6 +47,45 @@ def setup_logger(name):
         backupCount=5
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+
+    return [console_handler, file_handler]
+
+def setup_logger(name):
+    """
+    Set up logger with both file and console handlers
     
+    Args:
+        name: Logger name (usually __name__)
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    
+    for handler in _create_handlers():
+        logger.addHandler(handler)
+    
+    return logger
+
+def setup_queued_logger(name):
+    """
+    Set up logger whose console and file output happens on a background thread
+
+    Records are put on a queue and written by a single QueueListener, so
+    logging from async code never blocks the event loop on stdout or disk I/O.
+    The listener is stopped (and the queue flushed) at interpreter exit.
+
+    Args:
+        name: Logger name (usually __name__)
+    """
+    global _log_queue, _queue_listener
+
+    if _queue_listener is None:
+        _log_queue = queue.SimpleQueue()
+        _queue_listener = QueueListener(_log_queue, *_create_handlers(), respect_handler_level=True)
+        _queue_listener.start()
+        atexit.register(_queue_listener.stop)
+
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.addHandler(QueueHandler(_log_queue))
+
     return logger
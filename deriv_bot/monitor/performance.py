@@ -29,21 +29,56 @@ from deriv_bot.monitor.logger import setup_logger
 logger = setup_logger(__name__)
 
 class PerformanceTracker:
-    def __init__(self):
-        self.trades = []
+    # Trade record layout; field names match the exported columns, except
+    # timestamp_ns, which is exported as a 'timestamp' datetime column
+    TRADE_DTYPE = np.dtype([
+        ('symbol', 'U16'),
+        ('type', 'U4'),
+        ('amount', 'f8'),
+        ('entry_price', 'f8'),
+        ('exit_price', 'f8'),
+        ('predicted_change', 'f8'),
+        ('actual_change', 'f8'),
+        ('confidence', 'f8'),
+        ('timestamp_ns', 'i8'),
+        ('profit', 'f8'),
+        ('running_balance', 'f8'),
+        ('drawdown', 'f8'),
+        ('prediction_error', 'f8'),
+        ('prediction_direction_correct', '?')
+    ])
+
+    def __init__(self, capacity=256):
+        """
+        Initialize tracker
+
+        Args:
+            capacity: Initial number of trade records to preallocate; grows by doubling
+        """
+        self._trades = np.zeros(capacity, dtype=self.TRADE_DTYPE)
+        self._n = 0
         self.wins = 0
         self.losses = 0
         self.total_profit = 0
         self.max_drawdown = 0
         self.running_balance = 0
         self.peak_balance = 0
+        self._stats = None  # Statistics computed for the first _stats_n trades
+        self._stats_n = None
+
+    @property
+    def trades(self):
+        """Structured array view of the recorded trades"""
+        return self._trades[:self._n]
 
     def add_trade(self, trade_data):
         """
         Record a completed trade with enhanced metrics
 
         Args:
-            trade_data: Dictionary containing trade details
+            trade_data: Dictionary containing trade details; the trade time is
+                given as 'timestamp_ns' (epoch nanoseconds, e.g. time.time_ns())
+                or as a datetime / ISO string under 'timestamp'
         """
         try:
             # Calculate profit based on entry and exit prices
@@ -63,19 +98,32 @@ class PerformanceTracker:
             current_drawdown = (self.peak_balance - self.running_balance) / self.peak_balance if self.peak_balance > 0 else 0
             self.max_drawdown = max(self.max_drawdown, current_drawdown)
 
-            # Add enhanced metrics to trade data
-            trade_data.update({
-                'profit': profit,
-                'running_balance': self.running_balance,
-                'drawdown': current_drawdown,
-                'prediction_error': abs(trade_data['predicted_change'] - trade_data['actual_change']),
-                'prediction_direction_correct': (
-                    (trade_data['type'] == 'CALL' and trade_data['actual_change'] > 0) or
-                    (trade_data['type'] == 'PUT' and trade_data['actual_change'] < 0)
-                )
-            })
-
-            self.trades.append(trade_data)
+            # Double the preallocated storage when full (amortized O(1) appends)
+            if self._n == len(self._trades):
+                grown = np.zeros(max(1, 2 * len(self._trades)), dtype=self.TRADE_DTYPE)
+                grown[:self._n] = self._trades
+                self._trades = grown
+
+            # Write the trade and its enhanced metrics into the next record
+            self._trades[self._n] = (
+                trade_data['symbol'],
+                trade_data['type'],
+                amount,
+                entry_price,
+                exit_price,
+                trade_data['predicted_change'],
+                trade_data['actual_change'],
+                trade_data['confidence'],
+                trade_data['timestamp_ns'] if 'timestamp_ns' in trade_data
+                else pd.Timestamp(trade_data['timestamp']).value,
+                profit,
+                self.running_balance,
+                current_drawdown,
+                abs(trade_data['predicted_change'] - trade_data['actual_change']),
+                (trade_data['type'] == 'CALL' and trade_data['actual_change'] > 0) or
+                (trade_data['type'] == 'PUT' and trade_data['actual_change'] < 0)
+            )
+            self._n += 1
 
             if profit > 0:
                 self.wins += 1
@@ -83,26 +131,36 @@ class PerformanceTracker:
                 self.losses += 1
 
             self.total_profit += profit
-            logger.info(f"Trade recorded: {trade_data}")
+            logger.info(f"Trade recorded: {dict(zip(self.TRADE_DTYPE.names, self._trades[self._n - 1].item()))}")
 
         except Exception as e:
             logger.error(f"Error recording trade: {str(e)}")
 
     def get_statistics(self):
-        """Calculate and return comprehensive performance statistics"""
+        """
+        Calculate and return comprehensive performance statistics
+
+        Statistics only change when a trade is recorded, so the result is
+        cached until the next add_trade instead of rescanning the history.
+        """
+        if self._stats is not None and self._stats_n == self._n:
+            return dict(self._stats)
+
         try:
             total_trades = self.wins + self.losses
             win_rate = (self.wins / total_trades * 100) if total_trades > 0 else 0
 
-            if self.trades:
-                df = pd.DataFrame(self.trades)
-                avg_prediction_error = df['prediction_error'].mean()
-                direction_accuracy = df['prediction_direction_correct'].mean() * 100
-                avg_profit_per_trade = df['profit'].mean()
-                profit_factor = abs(df[df['profit'] > 0]['profit'].sum() / df[df['profit'] < 0]['profit'].sum()) if len(df[df['profit'] < 0]) > 0 else float('inf')
+            if self._n:
+                trades = self.trades
+                profit = trades['profit']
+                avg_prediction_error = trades['prediction_error'].mean()
+                direction_accuracy = trades['prediction_direction_correct'].mean() * 100
+                avg_profit_per_trade = profit.mean()
+                losses = profit[profit < 0]
+                profit_factor = abs(profit[profit > 0].sum() / losses.sum()) if len(losses) > 0 else float('inf')
 
                 # Calculate Sharpe Ratio (assuming daily returns)
-                returns = df['profit'].pct_change()
+                returns = pd.Series(profit).pct_change()
                 sharpe_ratio = np.sqrt(252) * (returns.mean() / returns.std()) if len(returns) > 1 else 0
             else:
                 avg_prediction_error = 0
@@ -125,20 +183,39 @@ class PerformanceTracker:
                 'sharpe_ratio': sharpe_ratio
             }
 
-            return stats
+            self._stats, self._stats_n = stats, self._n
+            return dict(stats)
 
         except Exception as e:
             logger.error(f"Error calculating statistics: {str(e)}")
             return None
 
     def export_history(self, filename='trade_history.csv'):
-        """Export detailed trade history to CSV file"""
+        """
+        Export detailed trade history to a CSV or Parquet file
+
+        A filename ending in .parquet is written as zstd-compressed Parquet
+        (columnar, much smaller and faster than CSV for long runs). Without a
+        Parquet engine installed, a CSV with the same base name is written instead.
+
+        Args:
+            filename: Output path; the extension selects the format
+
+        Returns:
+            Path of the written file or None if nothing was exported
+        """
         try:
-            if not self.trades:
+            if not self._n:
                 logger.warning("No trades to export")
-                return
+                return None
 
-            df = pd.DataFrame(self.trades)
+            df = pd.DataFrame.from_records(self.trades)
+
+            # Trade times are kept as integers and converted for the whole column at once
+            df.insert(
+                df.columns.get_loc('timestamp_ns'), 'timestamp',
+                pd.to_datetime(df.pop('timestamp_ns'), unit='ns')
+            )
 
             # Add derived metrics
             if len(df) > 0:
@@ -146,11 +223,22 @@ class PerformanceTracker:
                 df['drawdown_pct'] = df['drawdown'] * 100
 
                 # Calculate rolling metrics
-                df['rolling_win_rate'] = df['profit'].rolling(window=10).apply(lambda x: (x > 0).mean() * 100)
+                df['rolling_win_rate'] = df['profit'].rolling(window=10).apply(lambda x: (x > 0).mean() * 100, raw=True)
                 df['rolling_avg_profit'] = df['profit'].rolling(window=10).mean()
 
+            if filename.endswith('.parquet'):
+                try:
+                    df.to_parquet(filename, index=False, compression='zstd')
+                    logger.info(f"Trade history exported to {filename}")
+                    return filename
+                except ImportError as e:
+                    filename = filename[:-len('.parquet')] + '.csv'
+                    logger.warning(f"Parquet export unavailable ({str(e)}), writing {filename} instead")
+
             df.to_csv(filename, index=False)
             logger.info(f"Trade history exported to {filename}")
+            return filename
 
         except Exception as e:
-            logger.error(f"Error exporting trade history: {str(e)}")
\ No newline at end of file
+            logger.error(f"Error exporting trade history: {str(e)}")
+            return None
\ No newline at end of file
@@ -12,12 +12,19 @@ class FeatureEngineer:
     def __init__(self):
         self.market_regimes = None
 
-    def calculate_features(self, df):
+    def calculate_features(self, df, fit_regimes=True):
         """
         Calculate technical indicators and features
 
+        Indicators are collected in a dict and joined to the frame in one step,
+        rather than inserted one column at a time (each insert can copy and
+        fragments the frame's blocks).
+
         Args:
             df: DataFrame with OHLCV data
+            fit_regimes: Fit the market regime clustering on df; when False the
+                clustering fitted by an earlier call is reused, so live windows
+                get the same regime labels as the training data
         """
         try:
             # Ensure DataFrame has required columns
@@ -27,35 +34,39 @@ class FeatureEngineer:
                 return None
 
             logger.info("Starting feature calculation")
+            features = {}
 
             # Add momentum indicators
-            df = self._add_momentum_indicators(df)
-            if df is None:
+            if not self._add_momentum_indicators(df, features):
                 return None
 
             # Add volatility indicators
-            df = self._add_volatility_indicators(df)
-            if df is None:
+            if not self._add_volatility_indicators(df, features):
                 return None
 
             # Add trend indicators
-            df = self._add_trend_indicators(df)
-            if df is None:
+            if not self._add_trend_indicators(df, features):
                 return None
 
             # Add market regime features
-            df = self._add_market_regime(df)
-            if df is None:
-                return None
+            self._add_market_regime(df, features, fit=fit_regimes)
 
             # Add price pattern features
-            df = self._add_price_patterns(df)
-            if df is None:
-                return None
+            self._add_price_patterns(df, features)
+
+            df = pd.concat(
+                [df.drop(columns=[col for col in features if col in df.columns]),
+                 pd.DataFrame(features, index=df.index)],
+                axis=1
+            )
 
             # Drop NaN values from calculations
             df.dropna(inplace=True)
 
+            # Indicator math promotes to float64; keep the frame in float32 like the candles
+            float64_columns = df.select_dtypes(include='float64').columns
+            df[float64_columns] = df[float64_columns].astype(np.float32)
+
             logger.info(f"Feature calculation completed. Final shape: {df.shape}")
             return df
 
@@ -63,104 +74,116 @@ class FeatureEngineer:
             logger.error(f"Error calculating features: {str(e)}")
             return None
 
-    def _add_momentum_indicators(self, df):
-        """Calculate momentum-based indicators"""
+    def _add_momentum_indicators(self, df, features):
+        """Calculate momentum-based indicators into features; returns False on failure"""
         try:
+            close = df['close']
+
             # RSI with multiple periods
+            delta = close.diff()
             for period in [9, 14, 21]:
-                delta = df['close'].diff()
                 gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
                 loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
                 rs = gain / loss
-                df[f'RSI_{period}'] = 100 - (100 / (1 + rs))
+                features[f'RSI_{period}'] = 100 - (100 / (1 + rs))
 
             # Enhanced MACD
             for (fast, slow, signal) in [(12, 26, 9), (5, 35, 5)]:
-                exp1 = df['close'].ewm(span=fast, adjust=False).mean()
-                exp2 = df['close'].ewm(span=slow, adjust=False).mean()
+                exp1 = close.ewm(span=fast, adjust=False).mean()
+                exp2 = close.ewm(span=slow, adjust=False).mean()
                 macd = exp1 - exp2
-                df[f'MACD_{fast}_{slow}'] = macd
-                df[f'MACD_Signal_{fast}_{slow}'] = macd.ewm(span=signal, adjust=False).mean()
+                features[f'MACD_{fast}_{slow}'] = macd
+                features[f'MACD_Signal_{fast}_{slow}'] = macd.ewm(span=signal, adjust=False).mean()
 
             # Stochastic RSI
             for period in [14, 21]:
-                if f'RSI_{period}' in df.columns:
-                    stoch_k = df[f'RSI_{period}'].rolling(window=14).apply(
+                if f'RSI_{period}' in features:
+                    stoch_k = features[f'RSI_{period}'].rolling(window=14).apply(
                         lambda x: (x[-1] - x.min()) / (x.max() - x.min()) * 100
-                        if x.max() != x.min() else 50
+                        if x.max() != x.min() else 50,
+                        raw=True  # Pass ndarrays instead of building a Series per window
                     )
-                    df[f'StochRSI_{period}'] = stoch_k.rolling(window=3).mean()
+                    features[f'StochRSI_{period}'] = stoch_k.rolling(window=3).mean()
 
-            return df
+            return True
 
         except Exception as e:
             logger.error(f"Error calculating momentum indicators: {str(e)}")
-            return None
+            return False
 
-    def _add_volatility_indicators(self, df):
-        """Calculate volatility-based indicators"""
+    def _add_volatility_indicators(self, df, features):
+        """Calculate volatility-based indicators into features; returns False on failure"""
         try:
+            close = df['close']
+
             # Enhanced Bollinger Bands
             for period in [20, 50]:
-                df[f'SMA_{period}'] = df['close'].rolling(window=period).mean()
-                std = df['close'].rolling(window=period).std()
-                df[f'BB_Upper_{period}'] = df[f'SMA_{period}'] + (std * 2)
-                df[f'BB_Lower_{period}'] = df[f'SMA_{period}'] - (std * 2)
-                df[f'BB_Width_{period}'] = (df[f'BB_Upper_{period}'] - df[f'BB_Lower_{period}']) / df[f'SMA_{period}']
-
-            # Average True Range (ATR) with multiple periods
+                sma = close.rolling(window=period).mean()
+                std = close.rolling(window=period).std()
+                upper = sma + (std * 2)
+                lower = sma - (std * 2)
+                features[f'SMA_{period}'] = sma
+                features[f'BB_Upper_{period}'] = upper
+                features[f'BB_Lower_{period}'] = lower
+                features[f'BB_Width_{period}'] = (upper - lower) / sma
+
+            # Average True Range (ATR) with multiple periods; the true range is the
+            # same for every period, so it is computed once
+            high_low = df['high'] - df['low']
+            high_close = np.abs(df['high'] - close.shift())
+            low_close = np.abs(df['low'] - close.shift())
+            ranges = pd.concat([high_low, high_close, low_close], axis=1)
+            true_range = np.max(ranges, axis=1)
             for period in [14, 21]:
-                high_low = df['high'] - df['low']
-                high_close = np.abs(df['high'] - df['close'].shift())
-                low_close = np.abs(df['low'] - df['close'].shift())
-                ranges = pd.concat([high_low, high_close, low_close], axis=1)
-                true_range = np.max(ranges, axis=1)
-                df[f'ATR_{period}'] = true_range.rolling(window=period).mean()
+                features[f'ATR_{period}'] = true_range.rolling(window=period).mean()
 
             # Volatility ratio
-            if 'ATR_14' in df.columns and 'ATR_21' in df.columns:
-                df['Volatility_Ratio'] = df['ATR_14'] / df['ATR_21']
+            if 'ATR_14' in features and 'ATR_21' in features:
+                features['Volatility_Ratio'] = features['ATR_14'] / features['ATR_21']
 
-            return df
+            return True
 
         except Exception as e:
             logger.error(f"Error calculating volatility indicators: {str(e)}")
-            return None
+            return False
 
-    def _add_trend_indicators(self, df):
-        """Calculate trend-based indicators"""
+    def _add_trend_indicators(self, df, features):
+        """Calculate trend-based indicators into features; returns False on failure"""
         try:
+            close = df['close']
+
             # Multiple timeframe moving averages
             for period in [10, 20, 50, 100]:
-                df[f'SMA_{period}'] = df['close'].rolling(window=period).mean()
-                df[f'EMA_{period}'] = df['close'].ewm(span=period, adjust=False).mean()
+                features[f'SMA_{period}'] = close.rolling(window=period).mean()
+                features[f'EMA_{period}'] = close.ewm(span=period, adjust=False).mean()
 
             # Add moving average crossovers
             for period in [10, 20, 50]:
-                if f'SMA_{period}' in df.columns and f'SMA_{period * 2}' in df.columns:
-                    df[f'MA_Cross_{period}'] = np.where(
-                        df[f'SMA_{period}'] > df[f'SMA_{period * 2}'], 1, -1
+                if f'SMA_{period}' in features and f'SMA_{period * 2}' in features:
+                    features[f'MA_Cross_{period}'] = np.where(
+                        features[f'SMA_{period}'] > features[f'SMA_{period * 2}'], 1, -1
                     )
 
             # Triple moving average crossover
-            if all(f'SMA_{p}' in df.columns for p in [10, 20, 50]):
-                df['Triple_MA_Cross'] = np.where(
-                    (df['SMA_10'] > df['SMA_20']) & (df['SMA_20'] > df['SMA_50']), 1,
-                    np.where((df['SMA_10'] < df['SMA_20']) & (df['SMA_20'] < df['SMA_50']), -1, 0)
+            if all(f'SMA_{p}' in features for p in [10, 20, 50]):
+                sma_10, sma_20, sma_50 = features['SMA_10'], features['SMA_20'], features['SMA_50']
+                features['Triple_MA_Cross'] = np.where(
+                    (sma_10 > sma_20) & (sma_20 > sma_50), 1,
+                    np.where((sma_10 < sma_20) & (sma_20 < sma_50), -1, 0)
                 )
 
             # Price Rate of Change for multiple periods
             for period in [5, 10, 20]:
-                df[f'ROC_{period}'] = df['close'].pct_change(periods=period) * 100
+                features[f'ROC_{period}'] = close.pct_change(periods=period) * 100
 
-            return df
+            return True
 
         except Exception as e:
             logger.error(f"Error calculating trend indicators: {str(e)}")
-            return None
+            return False
 
-    def _add_market_regime(self, df):
-        """Identify market regimes using clustering"""
+    def _add_market_regime(self, df, features, fit=True):
+        """Identify market regimes using clustering, refitting only when asked (or never fitted)"""
         try:
             # Calculate features for regime classification
             returns = df['close'].pct_change()
@@ -168,51 +191,53 @@ class FeatureEngineer:
             trend = df['close'].rolling(window=20).mean().pct_change()
 
             # Clean and prepare features for clustering
-            features = np.column_stack([
+            regime_inputs = np.column_stack([
                 returns.fillna(0),
                 volatility.fillna(0),
                 trend.fillna(0)
             ])
 
+            if not fit and self.market_regimes is not None:
+                features['Market_Regime'] = self.market_regimes.predict(regime_inputs)
+                return
+
             # Apply K-means clustering
             n_regimes = 4  # Identify 4 market regimes
             kmeans = KMeans(n_clusters=n_regimes, random_state=42)
-            df['Market_Regime'] = kmeans.fit_predict(features)
+            features['Market_Regime'] = kmeans.fit_predict(regime_inputs)
 
             # Store clustering model for future use
             self.market_regimes = kmeans
 
-            return df
-
         except Exception as e:
             logger.error(f"Error calculating market regime: {str(e)}")
-            return df
 
-    def _add_price_patterns(self, df):
+    def _add_price_patterns(self, df, features):
         """Identify price patterns and candlestick patterns"""
         try:
             # Calculate candlestick body and shadows
-            df['Body'] = df['close'] - df['open']
-            df['Upper_Shadow'] = df['high'] - df[['open', 'close']].max(axis=1)
-            df['Lower_Shadow'] = df[['open', 'close']].min(axis=1) - df['low']
+            body = df['close'] - df['open']
+            abs_body = abs(body)
+            upper_shadow = df['high'] - df[['open', 'close']].max(axis=1)
+            lower_shadow = df[['open', 'close']].min(axis=1) - df['low']
+            features['Body'] = body
+            features['Upper_Shadow'] = upper_shadow
+            features['Lower_Shadow'] = lower_shadow
 
             # Identify doji patterns
-            df['Doji'] = (abs(df['Body']) <= 0.1 * (df['high'] - df['low'])).astype(int)
+            features['Doji'] = (abs_body <= 0.1 * (df['high'] - df['low'])).astype(int)
 
             # Identify hammer patterns
-            df['Hammer'] = (
-                (df['Lower_Shadow'] > 2 * abs(df['Body'])) &
-                (df['Upper_Shadow'] <= 0.1 * abs(df['Body']))
+            features['Hammer'] = (
+                (lower_shadow > 2 * abs_body) &
+                (upper_shadow <= 0.1 * abs_body)
             ).astype(int)
 
             # Identify shooting star patterns
-            df['Shooting_Star'] = (
-                (df['Upper_Shadow'] > 2 * abs(df['Body'])) &
-                (df['Lower_Shadow'] <= 0.1 * abs(df['Body']))
+            features['Shooting_Star'] = (
+                (upper_shadow > 2 * abs_body) &
+                (lower_shadow <= 0.1 * abs_body)
             ).astype(int)
 
-            return df
-
         except Exception as e:
             logger.error(f"Error calculating price patterns: {str(e)}")
-            return df
\ No newline at end of file
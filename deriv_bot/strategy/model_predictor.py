@@ -27,6 +27,7 @@ import os
 import numpy as np
 import glob
 import pickle
+import tensorflow as tf
 from tensorflow.keras.models import load_model
 from deriv_bot.monitor.logger import setup_logger
 
@@ -38,6 +39,11 @@ class ModelPredictor:
         self._single_model = None  # Private attribute for single model access
         self.max_expected_return = 0.005  # 0.5% max return for Forex
         self.scaler = scaler  # Store the scaler for denormalizing predictions
+        self._predict_fns = {}  # Traced inference functions per model name
+        self._ensemble_fn = None  # (models, traced function running all of them), see _get_ensemble_fn
+        self.jit_compile = True  # Compile inference with XLA; disabled automatically if unsupported
+        self._interpreters = {}  # Optional TFLite interpreters per model name, see enable_lite_inference
+        self.lite_num_threads = 1  # A single small sequence gains nothing from intra-op threads, only jitter
         if model_path:
             self.load_models(model_path)
 
@@ -344,12 +350,221 @@ class ModelPredictor:
 
         return False
 
+    def _get_predict_fn(self, name, model):
+        """
+        Get a traced inference function for a model
+
+        The function is traced once with a fixed (None, sequence_length, features)
+        signature, so repeated calls and different batch sizes reuse the same graph
+        instead of going through Keras' predict loop on every call. When jit_compile
+        is enabled the graph is compiled with XLA, fusing the LSTM ops into fewer kernels.
+        The concrete function is returned, so calls skip tf.function's per-call
+        signature matching.
+        """
+        cached = self._predict_fns.get(name)
+        if cached is not None and cached[0] is model:
+            return cached[1]
+
+        _, seq_len, n_features = model.input_shape
+        predict_fn = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec(shape=(None, seq_len, n_features), dtype=tf.float32)],
+            jit_compile=self.jit_compile
+        ).get_concrete_function()
+        self._predict_fns[name] = (model, predict_fn)
+        return predict_fn
+
+    def _get_ensemble_fn(self):
+        """
+        Get one traced function that runs every model on the same input
+
+        An ensemble otherwise makes one host-to-device copy and one graph call
+        per model; the fused function takes the input once and returns the last
+        sequence's prediction from each model, in self.models order.
+
+        Returns:
+            Concrete traced function, or None when there is nothing to fuse (a
+            single model, TFLite serving, or models with different input shapes)
+        """
+        models = tuple(self.models.values())
+        if len(models) < 2 or self._interpreters:
+            return None
+        if len({model.input_shape for model in models}) != 1:
+            return None
+
+        cached = self._ensemble_fn
+        if cached is not None and len(cached[0]) == len(models) and all(a is b for a, b in zip(cached[0], models)):
+            return cached[1]
+
+        _, seq_len, n_features = models[0].input_shape
+        ensemble_fn = tf.function(
+            lambda x: tf.stack([model(x, training=False)[-1, 0] for model in models]),
+            input_signature=[tf.TensorSpec(shape=(None, seq_len, n_features), dtype=tf.float32)],
+            jit_compile=self.jit_compile
+        ).get_concrete_function()
+        self._ensemble_fn = (models, ensemble_fn)
+        return ensemble_fn
+
+    def _predict_all(self, sequence):
+        """
+        Predict the last sequence of a batch with every loaded model
+
+        Returns:
+            Dict of model name to raw prediction
+        """
+        ensemble_fn = self._get_ensemble_fn()
+        if ensemble_fn is None:
+            return {name: self._predict_last(name, model, sequence) for name, model in self.models.items()}
+
+        inputs = tf.constant(sequence, dtype=tf.float32)
+        try:
+            preds = ensemble_fn(inputs).numpy()
+        except Exception as e:
+            if not self.jit_compile:
+                raise
+            logger.warning(f"XLA compilation failed for the model ensemble, falling back to graph mode: {str(e)}")
+            self.jit_compile = False
+            self._predict_fns.clear()
+            self._ensemble_fn = None
+            preds = self._get_ensemble_fn()(inputs).numpy()
+        return dict(zip(self.models.keys(), preds))
+
+    def enable_lite_inference(self, float16=True):
+        """
+        Convert the loaded models to TFLite interpreters for single-sequence inference
+
+        With float16 the weights are stored in half precision, halving the
+        model's memory traffic per prediction. Models that fail to convert keep
+        using the traced TensorFlow function.
+
+        Args:
+            float16: Quantize weights to float16
+
+        Returns:
+            Number of models served by TFLite
+        """
+        if self._single_model is not None and not self.models:
+            self.models['default'] = self._single_model
+
+        for name, model in self.models.items():
+            try:
+                converter = tf.lite.TFLiteConverter.from_keras_model(model)
+                if float16:
+                    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+                    converter.target_spec.supported_types = [tf.float16]
+                interpreter = tf.lite.Interpreter(
+                    model_content=converter.convert(),
+                    num_threads=self.lite_num_threads
+                )
+
+                # Fix the input to a single sequence so tensors are allocated once
+                _, seq_len, n_features = model.input_shape
+                input_index = interpreter.get_input_details()[0]['index']
+                interpreter.resize_tensor_input(input_index, [1, seq_len, n_features])
+                interpreter.allocate_tensors()
+                output_index = interpreter.get_output_details()[0]['index']
+
+                self._interpreters[name] = (model, interpreter, input_index, output_index)
+            except Exception as e:
+                logger.warning(f"TFLite conversion failed for model {name}, keeping TensorFlow inference: {str(e)}")
+
+        logger.info(f"TFLite inference enabled for {len(self._interpreters)}/{len(self.models)} model(s)")
+        return len(self._interpreters)
+
+    def _predict_last(self, name, model, sequence):
+        """Run a batch of sequences through a model and return the last row's prediction"""
+        lite = self._interpreters.get(name)
+        if lite is not None and lite[0] is model:
+            _, interpreter, input_index, output_index = lite
+            # Write straight into the interpreter's fixed (1, seq_len, features) input buffer
+            interpreter.tensor(input_index)()[...] = sequence[-1:]
+            interpreter.invoke()
+            return interpreter.get_tensor(output_index)[0][0]
+
+        inputs = tf.constant(sequence, dtype=tf.float32)
+        predict_fn = self._get_predict_fn(name, model)
+        try:
+            pred = predict_fn(inputs).numpy()
+        except Exception as e:
+            if not self.jit_compile:
+                raise
+            logger.warning(f"XLA compilation failed for model {name}, falling back to graph mode: {str(e)}")
+            self.jit_compile = False
+            self._predict_fns.clear()
+            pred = self._get_predict_fn(name, model)(inputs).numpy()
+        return pred[-1][0]
+
+    def warmup(self):
+        """
+        Trace (and XLA-compile) every model's inference function ahead of time
+
+        The first call of a traced function pays for tracing and compilation,
+        so running one dummy batch before trading keeps that cost out of the
+        first live prediction.
+
+        Returns:
+            Number of models warmed up
+        """
+        if self._single_model is not None and not self.models:
+            self.models['default'] = self._single_model
+
+        warmed = 0
+        for name, model in self.models.items():
+            try:
+                _, seq_len, n_features = model.input_shape
+                self._predict_last(name, model, np.zeros((1, seq_len, n_features), dtype=np.float32))
+                warmed += 1
+            except Exception as e:
+                logger.warning(f"Warm-up failed for model {name}: {str(e)}")
+
+        # The fused ensemble function is a separate graph and needs its own trace
+        if warmed and self._get_ensemble_fn() is not None:
+            try:
+                _, seq_len, n_features = self.model.input_shape
+                self._predict_all(np.zeros((1, seq_len, n_features), dtype=np.float32))
+            except Exception as e:
+                logger.warning(f"Warm-up failed for the model ensemble: {str(e)}")
+
+        logger.info(f"Warmed up {warmed}/{len(self.models)} model(s) for inference")
+        return warmed
+
+    def _summarize(self, predictions):
+        """
+        Combine clipped per-model predictions into ensemble statistics
+
+        Shared by predict and get_prediction_metrics so both score confidence
+        identically from one pass over the predictions.
+
+        Args:
+            predictions: Dict of model name to clipped prediction
+
+        Returns:
+            Dict with prediction (ensemble mean), confidence, prediction_spread
+            and prediction_magnitude
+        """
+        pred_array = np.fromiter(predictions.values(), dtype=np.float64, count=len(predictions))
+        ensemble_pred = pred_array.mean()
+
+        # Confidence from model agreement (10% of max return as the worst spread)
+        # and from prediction magnitude
+        max_expected_std = self.max_expected_return * 0.1
+        agreement_score = 1.0 - min(pred_array.std() / max_expected_std, 1.0)
+        magnitude_score = min(1.0, 1.0 - (abs(ensemble_pred) / self.max_expected_return))
+
+        return {
+            'prediction': ensemble_pred,
+            'confidence': 0.7 * agreement_score + 0.3 * magnitude_score,
+            'prediction_spread': pred_array.max() - pred_array.min(),
+            'prediction_magnitude': abs(ensemble_pred)
+        }
+
     def predict(self, sequence, confidence_threshold=0.6):
         """
         Make ensemble prediction with confidence score
 
         Args:
-            sequence: Input sequence of shape (1, sequence_length, features)
+            sequence: Input sequences of shape (batch, sequence_length, features);
+                      the prediction for the last sequence in the batch is used
             confidence_threshold: Minimum confidence required for valid prediction
         """
         try:
@@ -362,10 +577,7 @@ class ModelPredictor:
 
             # Get predictions from all models (returns as percentage change)
             predictions = {}
-            for name, model in self.models.items():
-                pred = model.predict(sequence, verbose=0)
-                pred_pct = pred[0][0]  # Already in percentage form (-1 to 1 scale)
-
+            for name, pred_pct in self._predict_all(sequence).items():  # Already in percentage form (-1 to 1 scale)
                 # Validate prediction range and handle excessive values
                 if abs(pred_pct) > self.max_expected_return:
                     logger.warning(f"Model {name} prediction {pred_pct:.2%} exceeds normal range")
@@ -375,28 +587,15 @@ class ModelPredictor:
 
                 predictions[name] = pred_pct
 
-            # Calculate ensemble prediction
-            pred_array = np.array(list(predictions.values()))
-            ensemble_pred = np.mean(pred_array)
-
-            # Calculate prediction confidence based on model agreement
-            pred_std = np.std(pred_array)
-            max_expected_std = self.max_expected_return * 0.1  # 10% of max return
-            agreement_score = 1.0 - min(pred_std / max_expected_std, 1.0)
-
-            # Calculate confidence based on prediction magnitude
-            magnitude_score = min(1.0, 1.0 - (abs(ensemble_pred) / self.max_expected_return))
-
-            # Combined confidence score
-            confidence = 0.7 * agreement_score + 0.3 * magnitude_score
+            # Calculate ensemble prediction and confidence; the result also carries
+            # the fields get_prediction_metrics reports, without a second forward pass
+            result = self._summarize(predictions)
+            ensemble_pred = result['prediction']
+            confidence = result['confidence']
 
             # Return prediction only if confidence meets threshold
             if confidence >= confidence_threshold:
-                result = {
-                    'prediction': ensemble_pred,
-                    'confidence': confidence,
-                    'model_predictions': predictions
-                }
+                result['model_predictions'] = predictions
                 logger.info(f"Prediction made - Value: {ensemble_pred:.2%}, Confidence: {confidence:.2f}")
                 return result
             else:
@@ -427,29 +626,18 @@ class ModelPredictor:
                 self.models['default'] = self._single_model
 
             # Get individual model predictions
-            predictions = []
-            for name, model in self.models.items():
-                pred = model.predict(sequence, verbose=0)[0][0]
-
+            for name, pred in self._predict_all(sequence).items():
                 # Clip predictions to expected range
                 if abs(pred) > self.max_expected_return:
                     pred = max(min(pred, self.max_expected_return), -self.max_expected_return)
 
                 metrics['individual_predictions'][name] = pred
-                predictions.append(pred)
 
             # Calculate prediction spread and confidence
-            pred_array = np.array(predictions)
-            metrics['prediction_spread'] = np.max(pred_array) - np.min(pred_array)
-            metrics['prediction_magnitude'] = abs(np.mean(pred_array))
-
-            # Calculate confidence components
-            pred_std = np.std(pred_array)
-            max_expected_std = self.max_expected_return * 0.1
-            agreement_score = 1.0 - min(pred_std / max_expected_std, 1.0)
-            magnitude_score = min(1.0, 1.0 - (metrics['prediction_magnitude'] / self.max_expected_return))
-
-            metrics['confidence_score'] = 0.7 * agreement_score + 0.3 * magnitude_score
+            summary = self._summarize(metrics['individual_predictions'])
+            metrics['prediction_spread'] = summary['prediction_spread']
+            metrics['prediction_magnitude'] = summary['prediction_magnitude']
+            metrics['confidence_score'] = summary['confidence']
 
             return metrics
 
@@ -23,6 +23,7 @@ Last modified: 2024-02-27
 """
 import numpy as np
 import glob
+import hashlib
 import pickle
 import os
 from sklearn.model_selection import train_test_split
@@ -34,6 +35,35 @@ from deriv_bot.monitor.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+_precision_configured = False
+
+def _configure_precision():
+    """
+    Enable mixed precision training when DERIV_BOT_MIXED_PRECISION is set
+
+    Accepts '1'/'float16' for mixed_float16 (GPUs with tensor cores) or
+    'bfloat16' for mixed_bfloat16 (Ampere+ GPUs, BF16-capable CPUs).
+    The global policy is applied once per process, before any model is built.
+    """
+    global _precision_configured
+    if _precision_configured:
+        return
+    _precision_configured = True
+
+    setting = os.getenv('DERIV_BOT_MIXED_PRECISION', '0').lower()
+    if setting in ('1', 'true', 'yes', 'float16'):
+        policy = 'mixed_float16'
+    elif setting == 'bfloat16':
+        policy = 'mixed_bfloat16'
+    else:
+        return
+
+    try:
+        tf.keras.mixed_precision.set_global_policy(policy)
+        logger.info(f"Mixed precision enabled with policy {policy}")
+    except Exception as e:
+        logger.warning(f"Could not enable mixed precision ({policy}): {str(e)}")
+
 class ModelTrainer:
     def __init__(self, input_shape, epochs=50):
         """
@@ -45,6 +75,7 @@ class ModelTrainer:
         """
         self.input_shape = input_shape
         self.default_epochs = epochs if epochs is not None else 50  # Ensure default_epochs is never None
+        _configure_precision()
         self.model = self._build_lstm_model(units=128)  # Default to medium model
         logger.info(f"Model trainer initialized with input shape {input_shape} and default epochs {self.default_epochs}")
 
@@ -62,7 +93,7 @@ class ModelTrainer:
             LSTM(units=units // 2, return_sequences=False),
             Dropout(dropout_rate),
             Dense(units=32, activation='relu'),
-            Dense(units=1)
+            Dense(units=1, dtype='float32')  # Keep output in float32 under mixed precision
         ])
 
         model.compile(optimizer='adam', loss='huber')  # Huber loss for robustness
@@ -198,6 +229,65 @@ class ModelTrainer:
             logger.error(f"Error in model training: {str(e)}")
             return None
 
+    def train_or_load(self, X, y, cache_dir='.model_cache', max_cached=5, validation_split=0.2,
+                      epochs=None, batch_size=32, model_type=None):
+        """
+        Train the model, or load the one trained earlier on identical data
+
+        Trained models are cached on disk keyed on a fingerprint of X, y, the
+        model architecture and the training parameters, so rerunning on the same
+        data (e.g. repeated simulation runs) skips training.
+
+        Args:
+            X: Input sequences
+            y: Target values
+            cache_dir: Directory of cached models
+            max_cached: Number of most recent cached models to keep
+            validation_split, epochs, batch_size, model_type: As for train
+
+        Returns:
+            History object from training (empty on a cache hit) or None if training failed
+        """
+        if epochs is None:
+            epochs = self.default_epochs
+
+        try:
+            fingerprint = hashlib.sha1()
+            for array in (X, y):
+                fingerprint.update(str((array.shape, array.dtype.str)).encode())
+                fingerprint.update(np.ascontiguousarray(array).tobytes())
+            fingerprint.update(self.model.to_json().encode())
+            fingerprint.update(str((validation_split, epochs, batch_size, model_type)).encode())
+            cache_path = os.path.join(cache_dir, f"{fingerprint.hexdigest()}.keras")
+
+            if os.path.exists(cache_path):
+                self.model = tf.keras.models.load_model(cache_path)
+                os.utime(cache_path)  # Mark as recently used for pruning
+                logger.info(f"Loaded model trained on identical data from {cache_path}")
+                return tf.keras.callbacks.History()
+        except Exception as e:
+            logger.warning(f"Model cache lookup failed, training instead: {str(e)}")
+            cache_path = None
+
+        history = self.train(X, y, validation_split=validation_split, epochs=epochs,
+                             batch_size=batch_size, model_type=model_type)
+
+        if history and cache_path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Write under a temporary name so a partial file is never picked up
+                tmp_path = cache_path[:-len('.keras')] + '.tmp.keras'
+                self.model.save(tmp_path)
+                os.replace(tmp_path, cache_path)
+
+                cached = sorted(glob.glob(os.path.join(cache_dir, '*.keras')), key=os.path.getmtime, reverse=True)
+                for stale in cached[max_cached:]:
+                    os.remove(stale)
+            except Exception as e:
+                logger.warning(f"Could not cache trained model: {str(e)}")
+
+        return history
+
     def save_model(self, path, scaler=None):
         """
         Save model to the specified path using native Keras format, along with metadata
@@ -30,6 +30,7 @@ import time
 from pathlib import Path
 from dotenv import load_dotenv
 from deriv_bot.monitor.logger import setup_logger
+from deriv_bot.utils.env_check import missing_env
 
 logger = setup_logger(__name__)
 
@@ -107,10 +108,7 @@ class Config:
                 'DERIV_BOT_ENV'
             ]
 
-            missing_vars = []
-            for var in required_vars:
-                if not os.getenv(var):
-                    missing_vars.append(var)
+            missing_vars = missing_env(required_vars)
 
             if missing_vars:
                 logger.warning(f"Missing environment variables: {', '.join(missing_vars)}")
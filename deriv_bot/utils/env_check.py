@@ -0,0 +1,49 @@
+"""
+Environment Check Module
+
+Location: deriv_bot/utils/env_check.py
+
+Purpose:
+Shared helpers for reporting which environment variables are configured,
+so scripts and configuration loading check them the same way.
+
+Dependencies:
+- os: Environment access
+
+Interactions:
+- Input: Names of environment variables
+- Output: Missing variable lists and printable summaries
+- Relations: Used by Config and test_api_connectivity
+
+Author: Trading Bot Team
+Last modified: 2025-02-27
+"""
+import os
+
+def missing_env(names):
+    """
+    Get the environment variables that are unset or empty
+
+    Args:
+        names: Environment variable names to check
+
+    Returns:
+        List of missing names, in the order given
+    """
+    env = os.environ
+    return [name for name in names if not env.get(name)]
+
+def summarize_env(names):
+    """
+    Build a one-line-per-variable configuration summary
+
+    Args:
+        names: Environment variable names to report
+
+    Returns:
+        Multi-line string such as "- APP_ID: ✅ Configured"
+    """
+    env = os.environ
+    return "\n".join(
+        f"- {name}: {'✅ Configured' if env.get(name) else '❌ Not configured'}" for name in names
+    )
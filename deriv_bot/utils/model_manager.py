@@ -48,6 +48,8 @@ class ModelManager:
         self.models_dir = models_dir
         self.archive_dir = archive_dir
         self.max_models = max_models
+        # Cache of model_type -> (path, modification datetime), refreshed on save
+        self._model_info = {}
 
         # Create directories if they don't exist
         os.makedirs(self.models_dir, exist_ok=True)
@@ -223,6 +225,36 @@ class ModelManager:
             logger.error(f"Error in get_best_model_path: {str(e)}")
             return None
 
+    def model_info(self, model_type=None):
+        """
+        Get path and modification time of the current model for a type
+
+        Looks up the filesystem only the first time a type is requested; later
+        calls are served from the cache, which save_model_with_timestamp keeps
+        up to date.
+
+        Args:
+            model_type: Optional model type filter (e.g., 'short_term', 'long_term')
+
+        Returns:
+            Tuple (path, modification datetime) or None if no model exists
+        """
+        if model_type in self._model_info:
+            return self._model_info[model_type]
+
+        model_path = self.get_best_model_path(model_type=model_type)
+        if not model_path:
+            return None
+
+        try:
+            mtime = datetime.datetime.fromtimestamp(os.path.getmtime(model_path))
+        except OSError as e:
+            logger.error(f"Error reading model modification time for {model_path}: {str(e)}")
+            return None
+
+        self._model_info[model_type] = (model_path, mtime)
+        return self._model_info[model_type]
+
     def save_model_with_timestamp(self, model, base_name="trained_model", model_type=None, scaler=None):
         """
         Save model with timestamp to prevent overwriting
@@ -246,6 +278,7 @@ class ModelManager:
             # Save the model in native Keras format without any additional parameters
             model.save(save_path)
             logger.info(f"Model saved to {save_path}")
+            self._model_info[model_type] = (save_path, datetime.datetime.now())
 
             # Initialize metadata dictionary
             metadata = {}
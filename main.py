@@ -33,9 +33,6 @@ import pandas as pd  # Add explicit pandas import
 import numpy as np   # Add numpy import for completeness
 from deriv_bot.data.deriv_connector import DerivConnector
 from deriv_bot.data.data_fetcher import DataFetcher
-from deriv_bot.data.data_processor import DataProcessor
-from deriv_bot.strategy.model_trainer import ModelTrainer
-from deriv_bot.strategy.model_predictor import ModelPredictor
 from deriv_bot.risk.risk_manager import RiskManager
 from deriv_bot.execution.order_executor import OrderExecutor
 from deriv_bot.monitor.logger import setup_logger
@@ -49,6 +46,13 @@ logger = setup_logger(__name__)
 # Global variable to handle graceful shutdown
 shutdown_requested = False
 
+# Minimum predicted move (0.1%) required to place a trade
+_PRED_THRESHOLD = np.float64(0.001)  # Same precision as the ensemble mean it is compared with
+
+# Large history requests are split into windows of this many candles and fetched concurrently
+HISTORY_CHUNK_SIZE = 100
+MAX_CONCURRENT_HISTORY_REQUESTS = 4
+
 def signal_handler(sig, frame):
     """Handle Ctrl+C and other termination signals"""
     global shutdown_requested
@@ -131,6 +135,8 @@ async def initialize_components(args, config):
             raise Exception("Failed to connect to Deriv API after multiple attempts")
 
         # Initialize components
+        # Imported here so --check-connection does not pay for sklearn/TensorFlow imports
+        from deriv_bot.data.data_processor import DataProcessor
         data_fetcher = DataFetcher(connector)
         data_processor = DataProcessor()
 
@@ -216,6 +222,83 @@ async def maintain_connection(connector):
     logger.info("Connection maintenance loop terminated")
     return True
 
+async def prefetch_sequences(components, symbol, prepared):
+    """
+    Keep the newest prepared input sequence ready for the trading loop
+
+    Runs alongside the loop so fetching and preprocessing happen while the
+    loop waits between iterations. Windows come from the candle subscription,
+    which is only made again after a reconnect (a quiet stream stays
+    subscribed), with history polling as a fallback. A sequence is prepared
+    only when a new candle opens, since the loop takes at most one per candle;
+    only the latest sequence is kept.
+
+    Args:
+        components: Initialized bot components
+        symbol: Trading symbol
+        prepared: One-slot asyncio.Queue receiving input sequences
+    """
+    data_fetcher = components['data_fetcher']
+    prepared_candle = None  # Open time of the newest candle in the last prepared window
+
+    while not shutdown_requested:
+        try:
+            live_candles = data_fetcher.is_subscribed(symbol, interval=60)
+            if live_candles:
+                latest_data = await data_fetcher.get_live_candles(symbol, interval=60, timeout=30)
+                if latest_data is None:
+                    continue  # No update yet (e.g. market closed); keep waiting on the subscription
+            else:
+                latest_data = await data_fetcher.subscribe_candles(symbol, interval=60, count=60)
+                live_candles = latest_data is not None
+                if latest_data is None:
+                    latest_data = await data_fetcher.fetch_historical_data(symbol, interval=60, count=60)
+
+            if latest_data is None:
+                logger.warning("Failed to fetch latest data, retrying...")
+                await asyncio.sleep(60)
+                continue
+
+            # Updates within the forming candle arrive about once a second; skip them
+            newest_candle = latest_data.index[-1]
+            if newest_candle == prepared_candle:
+                if not live_candles:
+                    await asyncio.sleep(60)
+                continue
+
+            # Build only the trailing sequence needed for prediction
+            sequence = await asyncio.to_thread(components['data_processor'].prepare_latest_sequence, latest_data)
+            if sequence is None:
+                logger.warning("Failed to process latest data, retrying...")
+                await asyncio.sleep(60)
+                continue
+
+            # Latest wins: replace a sequence the loop has not taken yet
+            if prepared.full():
+                prepared.get_nowait()
+            prepared.put_nowait(sequence)
+            prepared_candle = newest_candle
+
+            if not live_candles:
+                await asyncio.sleep(60)  # Polling history no faster than the loop trades
+
+        except Exception as e:
+            logger.error(f"Error prefetching market data: {str(e)}")
+            await asyncio.sleep(60)
+
+async def hourly_metrics(components, execution_start):
+    """Log performance metrics once per hour, independent of the trading loop"""
+    while not shutdown_requested:
+        await asyncio.sleep(3600)
+        try:
+            metrics = components['performance_tracker'].get_statistics()
+            logger.info("\n=== Hourly Performance Update ===")
+            logger.info(f"Total Runtime: {datetime.now() - execution_start}")
+            logger.info(f"Performance Metrics: {metrics}")
+            logger.info("=================================")
+        except Exception as e:
+            logger.error(f"Error logging hourly metrics: {str(e)}")
+
 async def load_historical_data(data_fetcher, args, symbol, count=1000):
     """
     Load historical data from API and/or local files
@@ -255,9 +338,22 @@ async def load_historical_data(data_fetcher, args, symbol, count=1000):
         api_data = None
         if data_source in ['api', 'both']:
             logger.info(f"Fetching {count} historical data points for {symbol} from API...")
-            api_data = await data_fetcher.fetch_historical_data(
-                symbol, interval=60, count=count
-            )
+            api_data = None
+            if count > 2 * HISTORY_CHUNK_SIZE:
+                api_data = await data_fetcher.fetch_historical_data_chunked(
+                    symbol, 60, count,
+                    chunk=HISTORY_CHUNK_SIZE,
+                    max_concurrent=MAX_CONCURRENT_HISTORY_REQUESTS
+                )
+                if api_data is None or len(api_data) < count * 0.8:
+                    # Market closures leave gaps in fixed time windows; fall back to a count-based request
+                    logger.warning("Windowed history fetch incomplete, falling back to a single request")
+                    api_data = None
+
+            if api_data is None:
+                api_data = await data_fetcher.fetch_historical_data(
+                    symbol, interval=60, count=count
+                )
 
             if api_data is None:
                 logger.error("Failed to fetch data from API")
@@ -306,6 +402,10 @@ async def train_model(components, historical_data, model_type='standard', save_t
         save_timestamp: Whether to save model with timestamp (prevents overwriting)
         args: Command line arguments for additional parameters
     """
+    # TensorFlow is only imported once training is actually needed
+    from deriv_bot.strategy.model_trainer import ModelTrainer
+    from deriv_bot.strategy.model_predictor import ModelPredictor
+
     try:
         # Get custom training parameters if provided
         sequence_length = args.sequence_length if args and args.sequence_length else None
@@ -313,8 +413,10 @@ async def train_model(components, historical_data, model_type='standard', save_t
 
         logger.info(f"Training {model_type} model with {len(historical_data)} data points")
 
-        # Process data for training
-        processed_data = components['data_processor'].prepare_data(
+        # Process data for training; CPU-bound work runs in a worker thread so the
+        # event loop keeps servicing the connection heartbeat
+        processed_data = await asyncio.to_thread(
+            components['data_processor'].prepare_data,
             historical_data,
             sequence_length=sequence_length
         )
@@ -336,7 +438,7 @@ async def train_model(components, historical_data, model_type='standard', save_t
             epochs=epochs if epochs is not None else 50  # Provide default value if None
         )
 
-        history = model_trainer.train(X, y, model_type=model_type)
+        history = await asyncio.to_thread(model_trainer.train, X, y, model_type=model_type)
 
         if history:
             logger.info(f"{model_type} model training completed successfully")
@@ -401,25 +503,34 @@ async def train_model(components, historical_data, model_type='standard', save_t
         logger.error(f"Error training {model_type} model: {str(e)}")
         return None
 
-async def execute_trade(components, predictor, symbol, sequence):
-    """Execute a trade based on model prediction"""
+async def execute_trade(order_executor, risk_manager, connector, predictor, symbol, sequence, amount, duration):
+    """
+    Execute a trade based on model prediction
+
+    Args:
+        order_executor: OrderExecutor used to place the order
+        risk_manager: RiskManager used to validate the trade
+        connector: API connector passed through to risk validation
+        predictor: ModelPredictor producing the prediction
+        symbol: Trading symbol
+        sequence: Input sequence for the predictor
+        amount: Stake amount
+        duration: Contract duration in seconds
+    """
     try:
-        prediction_result = predictor.predict(sequence)
+        # Inference is synchronous TF work; keep it off the event loop
+        prediction_result = await asyncio.to_thread(predictor.predict, sequence)
 
         if prediction_result is not None:
             prediction = prediction_result['prediction']
-            confidence = prediction_result['confidence']
-
-            logger.info(f"Prediction: {prediction:.2%} (confidence: {confidence:.2f})")
 
             # Execute trade if prediction is significant
-            amount = components['config'].trading_config['stake_amount']
-            if abs(prediction) >= 0.001:  # 0.1% minimum move
-                if components['risk_manager'].validate_trade(symbol, amount, prediction, connector=components['connector']):
-                    contract_type = 'CALL' if prediction > 0 else 'PUT'
-                    duration = components['config'].trading_config['duration']
+            if np.abs(prediction) >= _PRED_THRESHOLD:
+                logger.info(f"Prediction: {prediction:.2%} (confidence: {prediction_result['confidence']:.2f})")
+                if risk_manager.validate_trade(symbol, amount, prediction, connector=connector):
+                    contract_type = 'PUT' if np.signbit(prediction) else 'CALL'
 
-                    result = await components['order_executor'].place_order(
+                    result = await order_executor.place_order(
                         symbol,
                         contract_type,
                         amount,
@@ -510,10 +621,14 @@ async def main():
     # Initialize configuration
     config = Config()
     components = None
-    last_training = None
+    last_training_mono = None
     training_interval = timedelta(hours=args.train_interval)  # Use specified training interval
-    execution_start = datetime.now()
+    training_interval_seconds = training_interval.total_seconds()
+    execution_start = datetime.now()  # Wall-clock start, used for logging only
+    execution_start_mono = time.monotonic()  # Monotonic start, used for interval math
     reconnection_task = None
+    metrics_task = None
+    prefetch_task = None
     predictors = {}
 
     try:
@@ -586,36 +701,45 @@ async def main():
         # Start connection maintenance task
         reconnection_task = asyncio.create_task(maintain_connection(components['connector']))
 
+        # Start hourly performance reporting task
+        metrics_task = asyncio.create_task(hourly_metrics(components, execution_start))
+
         consecutive_errors = 0
         max_consecutive_errors = 5
 
+        from deriv_bot.strategy.model_predictor import ModelPredictor
+
         # Initial training if no models exist or they're too old
         for model_type in args.model_types:
-            model_path = components['model_manager'].get_best_model_path(model_type=model_type)
-            if model_path and os.path.exists(model_path):
+            model_info = components['model_manager'].model_info(model_type)
+            if model_info:
                 # Use existing model
-                model_age = datetime.now() - datetime.fromtimestamp(os.path.getmtime(model_path))
+                model_path, model_mtime = model_info
+                model_age = datetime.now() - model_mtime
                 if model_age > timedelta(days=1):
                     logger.info(f"Existing {model_type} model is {model_age.days} days old. Retraining...")
                     predictors[model_type] = None
                 else:
                     logger.info(f"Loading existing {model_type} model from {model_path}")
                     predictors[model_type] = ModelPredictor(model_path)
+                    await asyncio.to_thread(predictors[model_type].warmup)
             else:
                 logger.info(f"No existing {model_type} model found. Training new model...")
                 predictors[model_type] = None
 
+        # Track whether every model type has a predictor, so the loop does not rescan predictors
+        all_predictors_ready = all(predictor is not None for predictor in predictors.values())
+
         while not shutdown_requested:
             try:
                 # Check if retraining is needed
-                current_time = datetime.now()
-                execution_time = current_time - execution_start
-                logger.info(f"Bot running for: {execution_time}")
+                tick = time.monotonic()
+                logger.info(f"Bot running for: {timedelta(seconds=int(tick - execution_start_mono))}")
 
                 needs_training = (
-                    last_training is None or
-                    (current_time - last_training) > training_interval or
-                    any(predictor is None for predictor in predictors.values())
+                    last_training_mono is None or
+                    (tick - last_training_mono) > training_interval_seconds or
+                    not all_predictors_ready
                 )
 
                 if needs_training:
@@ -640,6 +764,7 @@ async def main():
                             )
 
                             if predictor:
+                                await asyncio.to_thread(predictor.warmup)
                                 predictors[model_type] = predictor
                                 logger.info(f"{model_type} model successfully trained")
                             else:
@@ -647,9 +772,10 @@ async def main():
                                 logger.error(f"{model_type} model training failed")
 
                         if training_success:
-                            last_training = current_time
+                            last_training_mono = tick
+                            all_predictors_ready = True
                             logger.info("All models successfully retrained")
-                            logger.info(f"Next training scheduled for: {current_time + training_interval}")
+                            logger.info(f"Next training scheduled for: {datetime.now() + training_interval}")
                             consecutive_errors = 0  # Reset error counter on successful training
                         else:
                             logger.warning("Some models failed to train")
@@ -682,57 +808,43 @@ async def main():
                     consecutive_errors = 0  # Reset errors since this is an expected condition
                     continue
 
-                # Get latest market data
-                latest_data = await components['data_fetcher'].fetch_historical_data(
-                    symbol,
-                    interval=60,
-                    count=60
-                )
-
-                if latest_data is None:
-                    logger.warning("Failed to fetch latest data, retrying...")
-                    consecutive_errors += 1
-                    await asyncio.sleep(60)
-                    continue
-
-                # Prepare data for prediction
-                processed_sequence = components['data_processor'].prepare_data(latest_data)
-                if processed_sequence is None:
-                    logger.warning("Failed to process latest data, retrying...")
-                    consecutive_errors += 1
-                    await asyncio.sleep(60)
-                    continue
-
-                X_latest, _, _ = processed_sequence
-                if X_latest is None or len(X_latest) == 0:
-                    logger.warning("Invalid sequence data, retrying...")
+                # Take the newest sequence prepared by the prefetch task; the timeout
+                # replaces a fixed retry sleep when market data stalls
+                if prefetch_task is None:
+                    prepared_sequences = asyncio.Queue(maxsize=1)
+                    prefetch_task = asyncio.create_task(
+                        prefetch_sequences(components, symbol, prepared_sequences)
+                    )
+                try:
+                    sequence = await asyncio.wait_for(prepared_sequences.get(), timeout=60)
+                except asyncio.TimeoutError:
+                    logger.warning("No fresh market data within 60s, retrying...")
                     consecutive_errors += 1
-                    await asyncio.sleep(60)
                     continue
 
-                # Get the last sequence for prediction
-                sequence = X_latest[-1:]
+                # Resolve trading parameters and components once per iteration
+                trading_config = components['config'].trading_config
+                stake_amount = trading_config['stake_amount']
+                duration = trading_config['duration']
+                order_executor = components['order_executor']
+                risk_manager = components['risk_manager']
+                connector = components['connector']
 
                 # Execute trade based on ensemble prediction from all model types
                 # Use the first available model for now (in future, could implement ensemble voting)
                 for model_type, predictor in predictors.items():
                     if predictor:
                         logger.info(f"Using {model_type} model for prediction")
-                        trade_executed = await execute_trade(components, predictor, symbol, sequence)
+                        trade_executed = await execute_trade(
+                            order_executor, risk_manager, connector, predictor,
+                            symbol, sequence, stake_amount, duration
+                        )
                         if trade_executed:
                             consecutive_errors = 0  # Reset error counter on successful trade
                         break
                 else:
                     logger.warning("No valid predictors available for trading")
 
-                # Log performance metrics periodically
-                if execution_time.total_seconds() % 3600 < 60:  # Every hour
-                    metrics = components['performance_tracker'].get_statistics()
-                    logger.info("\n=== Hourly Performance Update ===")
-                    logger.info(f"Total Runtime: {execution_time}")
-                    logger.info(f"Performance Metrics: {metrics}")
-                    logger.info("=================================")
-
                 # Wait before next iteration
                 await asyncio.sleep(60)
 
@@ -746,12 +858,23 @@ async def main():
     finally:
         if reconnection_task:
             reconnection_task.cancel()
+        if metrics_task:
+            metrics_task.cancel()
+        if prefetch_task:
+            prefetch_task.cancel()
 
         if components and components['connector']:
             await components['connector'].close()
             logger.info("Connection closed.")
 
 if __name__ == "__main__":
+    # Prefer the libuv-based loop when it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -11,13 +11,16 @@ import time
 import argparse
 from datetime import datetime
 from deriv_bot.data.deriv_connector import DerivConnector
+from deriv_bot.data.connector_pool import get_shared_connector, close_shared_connector
 from deriv_bot.data.data_fetcher import DataFetcher
 from deriv_bot.utils.config import Config
-from deriv_bot.monitor.logger import setup_logger
+from deriv_bot.utils.env_check import summarize_env
+from deriv_bot.monitor.logger import setup_queued_logger
 
-logger = setup_logger('api_test')
+logger = setup_queued_logger('api_test')
 
-async def test_api_connectivity(test_mode='demo', verbose=False, extended_test=False):
+async def test_api_connectivity(test_mode='demo', verbose=False, extended_test=False, max_concurrent_requests=5,
+                                reuse_connector=True):
     """
     Test basic API connectivity and data fetching
 
@@ -25,16 +28,13 @@ async def test_api_connectivity(test_mode='demo', verbose=False, extended_test=F
         test_mode: 'demo' or 'real' environment to test
         verbose: Show detailed output
         extended_test: Run more comprehensive tests
+        max_concurrent_requests: Concurrency limit for the request frequency test
     """
     try:
         # Check environment variables
-        print("\n===== API CONNECTIVITY TEST =====")
-        print("\nVerifying environment variables:")
+        logger.info("===== API CONNECTIVITY TEST =====")
         env_vars = ['DERIV_API_TOKEN_DEMO', 'DERIV_API_TOKEN_REAL', 'DERIV_BOT_ENV', 'APP_ID']
-        for var in env_vars:
-            value = os.getenv(var)
-            status = '✅ Configured' if value else '❌ Not configured'
-            print(f"- {var}: {status}")
+        logger.info("Verifying environment variables:\n%s", summarize_env(env_vars))
 
         # Configure the correct environment for testing
         config = Config()
@@ -46,128 +46,156 @@ async def test_api_connectivity(test_mode='demo', verbose=False, extended_test=F
                 # Temporarily set for testing
                 os.environ['DERIV_REAL_MODE_CONFIRMED'] = 'yes'
                 if not config.set_environment('real'):
-                    print("\n❌ Could not set REAL environment for testing")
-                    print("  Verify that DERIV_API_TOKEN_REAL is configured correctly")
+                    logger.error("❌ Could not set REAL environment for testing")
+                    logger.error("  Verify that DERIV_API_TOKEN_REAL is configured correctly")
                     return
             else:
-                print("\n❌ Cannot test REAL environment: Missing DERIV_API_TOKEN_REAL")
+                logger.error("❌ Cannot test REAL environment: Missing DERIV_API_TOKEN_REAL")
                 return
         else:
             # Ensure we're in demo mode for testing
             config.set_environment('demo')
 
-        print(f"\nTesting API connection in {config.get_environment().upper()} mode...")
+        logger.info("Testing API connection in %s mode...", config.get_environment().upper())
 
         # Create and test the connector
-        start_time = time.time()
-        connector = DerivConnector(config)
-        connected = await connector.connect()
+        start_time = time.perf_counter()
+        if reuse_connector:
+            connector = await get_shared_connector(config)
+            connected = connector is not None
+        else:
+            connector = DerivConnector(config)
+            connected = await connector.connect()
 
         if not connected:
-            print("❌ Failed to connect to Deriv API")
+            logger.error("❌ Failed to connect to Deriv API")
             return
 
-        connection_time = time.time() - start_time
-        print(f"✅ Successfully connected to Deriv API ({connection_time:.2f}s)")
+        connection_time = time.perf_counter() - start_time
+        logger.info("✅ Successfully connected to Deriv API (%.2fs)", connection_time)
 
-        # Test server time retrieval
-        print("\nVerifying server time...")
-        time_response = await connector.get_server_time()
+        # Run the independent checks concurrently over the same connection
+        logger.info("Verifying server time, symbols, historical data and tick subscription...")
+        data_fetcher = DataFetcher(connector)
+        results = await asyncio.gather(
+            connector.get_server_time(),
+            data_fetcher.get_available_symbols(),
+            data_fetcher.fetch_historical_data(
+                symbol="frxEURUSD",
+                interval=60,  # 1-minute candles
+                count=10  # Just a few candles for testing
+            ),
+            data_fetcher.subscribe_to_ticks("frxEURUSD"),
+            return_exceptions=True
+        )
+
+        # Report failures and treat them as missing results
+        for name, result in zip(["Server time", "Symbols", "Historical data", "Tick subscription"], results):
+            if isinstance(result, Exception):
+                logger.error("❌ %s check raised an error: %s", name, result)
+        time_response, symbols, historical_data, tick_response = [
+            None if isinstance(result, Exception) else result for result in results
+        ]
 
+        # Test server time retrieval
         if time_response and "time" in time_response:
             server_time = datetime.fromtimestamp(time_response["time"])
             local_time = datetime.now()
             time_diff = abs((local_time - server_time).total_seconds())
-            print(f"✅ Server time: {server_time}")
-            print(f"  Local time: {local_time}")
-            print(f"  Difference: {time_diff:.2f} seconds")
+            logger.info("✅ Server time: %s", server_time)
+            logger.info("  Local time: %s", local_time)
+            logger.info("  Difference: %.2f seconds", time_diff)
         else:
-            print("❌ Could not retrieve server time")
+            logger.error("❌ Could not retrieve server time")
 
         # Get available symbols
-        print("\nRetrieving available symbols...")
-        data_fetcher = DataFetcher(connector)
-        symbols = await data_fetcher.get_available_symbols()
-
         if symbols:
-            print(f"✅ Found {len(symbols)} trading symbols")
-            print("Example symbols:", symbols[:5])
+            logger.info("✅ Found %d trading symbols", len(symbols))
+            logger.info("Example symbols: %s", symbols[:5])
         else:
-            print("❌ Could not retrieve trading symbols")
+            logger.error("❌ Could not retrieve trading symbols")
 
         # Test historical data retrieval
-        print("\nTesting historical data retrieval for EUR/USD...")
-        historical_data = await data_fetcher.fetch_historical_data(
-            symbol="frxEURUSD",
-            interval=60,  # 1-minute candles
-            count=10  # Just a few candles for testing
-        )
-
         if historical_data is not None:
-            print(f"✅ Historical data successfully retrieved ({len(historical_data)} candles)")
-            print("\nSample data:")
-            print(historical_data.head())
+            logger.info("✅ Historical data successfully retrieved (%d candles)", len(historical_data))
+            if verbose:
+                logger.info("Sample data:\n%s", historical_data.head())
         else:
-            print("❌ Could not retrieve historical data")
+            logger.error("❌ Could not retrieve historical data")
 
         # Test tick subscription
-        print("\nTesting tick subscription...")
-        tick_response = await data_fetcher.subscribe_to_ticks("frxEURUSD")
-
         if tick_response and "error" not in tick_response:
-            print("✅ Tick subscription successful")
+            logger.info("✅ Tick subscription successful")
         else:
-            print("❌ Tick subscription failed")
+            logger.error("❌ Tick subscription failed")
 
         # Extended tests if requested
         if extended_test:
-            print("\n=== Running Extended Tests ===")
+            logger.info("=== Running Extended Tests ===")
 
             # Load test: try to get a large dataset
-            print("\nLoad test: Retrieving 1000 candles...")
-            start_time = time.time()
-            large_dataset = await data_fetcher.fetch_historical_data(
+            logger.info("Load test: Retrieving 1000 candles in chunks of 200...")
+            start_time = time.perf_counter()
+            large_dataset = await data_fetcher.fetch_historical_data_chunked(
                 symbol="frxEURUSD",
                 interval=60,
-                count=1000
+                count=1000,
+                chunk=200
             )
-            load_time = time.time() - start_time
+            load_time = time.perf_counter() - start_time
 
             if large_dataset is not None and len(large_dataset) > 900:
-                print(f"✅ Large dataset retrieved ({len(large_dataset)} candles in {load_time:.2f}s)")
+                logger.info("✅ Large dataset retrieved (%d candles in %.2fs)", len(large_dataset), load_time)
             else:
-                print(f"❌ Issues retrieving large dataset")
+                logger.error("❌ Issues retrieving large dataset")
                 if large_dataset is not None:
-                    print(f"  Requested 1000 candles, received {len(large_dataset)}")
+                    logger.error("  Requested 1000 candles, received %d", len(large_dataset))
 
-            # Reconnection test
-            print("\nReconnection test: Simulating disconnection...")
+            # Request frequency test
+            logger.info("Request frequency test: 5 rapid requests (max %d concurrent)...", max_concurrent_requests)
+            semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+            async def timed_request(i):
+                async with semaphore:
+                    start_req = time.perf_counter()
+                    mini_data = await data_fetcher.fetch_historical_data(
+                        symbol="frxEURUSD",
+                        interval=60,
+                        count=5
+                    )
+                    return i, mini_data, time.perf_counter() - start_req
+
+            for i, mini_data, req_time in await asyncio.gather(*(timed_request(i) for i in range(5))):
+                status = "✅" if mini_data is not None else "❌"
+                logger.info("  Request %d: %s (%.2fs)", i + 1, status, req_time)
+
+            # Batched request test: the same 5 requests pipelined in one round trip
+            logger.info("Batched request test: 5 requests in one round trip...")
+            start_req = time.perf_counter()
+            batch_results = await data_fetcher.fetch_historical_data_batch(
+                [{"symbol": "frxEURUSD", "interval": 60, "count": 5}] * 5
+            )
+            req_time = time.perf_counter() - start_req
+            received = sum(result is not None for result in batch_results)
+            status = "✅" if received == len(batch_results) else "❌"
+            logger.info("  %s %d/%d responses (%.2fs)", status, received, len(batch_results), req_time)
+
+            # Reconnection test last, so the load tests reuse the established connection
+            logger.info("Reconnection test: Simulating disconnection...")
             await connector.close()
             reconnect_result = await connector.reconnect()
 
             if reconnect_result:
-                print("✅ Reconnection successful")
+                logger.info("✅ Reconnection successful")
             else:
-                print("❌ Reconnection failed")
+                logger.error("❌ Reconnection failed")
 
-            # Request frequency test
-            print("\nRequest frequency test: 5 rapid requests...")
-            for i in range(5):
-                start_req = time.time()
-                mini_data = await data_fetcher.fetch_historical_data(
-                    symbol="frxEURUSD",
-                    interval=60,
-                    count=5
-                )
-                req_time = time.time() - start_req
-                status = "✅" if mini_data is not None else "❌"
-                print(f"  Request {i+1}: {status} ({req_time:.2f}s)")
-
-            print("\nExtended tests completed")
+            logger.info("Extended tests completed")
 
-        # Cleanup
-        await connector.close()
-        print("\n✅ Connection properly closed")
+        # Cleanup; a shared connector stays open for the next script in this loop
+        if not reuse_connector and connector.is_connected:
+            await connector.close()
+            logger.info("✅ Connection properly closed")
 
         # If we changed to real mode just for testing, restore
         if test_mode == 'real' and original_env != 'real':
@@ -176,20 +204,21 @@ async def test_api_connectivity(test_mode='demo', verbose=False, extended_test=F
                 os.environ['DERIV_REAL_MODE_CONFIRMED'] = original_confirmed
             else:
                 os.environ.pop('DERIV_REAL_MODE_CONFIRMED', None)
-            print(f"\nEnvironment restored to {config.get_environment().upper()}")
-
-        # Summary
-        print("\n=== Test Summary ===")
-        print(f"✅ Environment: {config.get_environment().upper()}")
-        print(f"✅ API Connection: {'Successful' if connected else 'Failed'}")
-        print(f"✅ Symbol Retrieval: {'Successful' if symbols else 'Failed'}")
-        print(f"✅ Historical Data: {'Successful' if historical_data is not None else 'Failed'}")
-        print(f"✅ Tick Subscription: {'Successful' if tick_response and 'error' not in tick_response else 'Failed'}")
-        print("\n============================")
+            logger.info("Environment restored to %s", config.get_environment().upper())
+
+        # Summary, printed once for human readability
+        print(
+            "\n=== Test Summary ===\n"
+            f"✅ Environment: {config.get_environment().upper()}\n"
+            f"✅ API Connection: {'Successful' if connected else 'Failed'}\n"
+            f"✅ Symbol Retrieval: {'Successful' if symbols else 'Failed'}\n"
+            f"✅ Historical Data: {'Successful' if historical_data is not None else 'Failed'}\n"
+            f"✅ Tick Subscription: {'Successful' if tick_response and 'error' not in tick_response else 'Failed'}\n"
+            "\n============================"
+        )
 
     except Exception as e:
-        print(f"\n❌ Error during test: {str(e)}")
-        logger.exception("Error during API test")
+        logger.exception("❌ Error during API test: %s", e)
 
 def main():
     """Main function with command line parser"""
@@ -200,18 +229,35 @@ def main():
                         help="Show verbose output")
     parser.add_argument("--extended", "-e", action="store_true",
                         help="Run extended tests")
+    parser.add_argument("--max-concurrent", type=int, default=5,
+                        help="Maximum concurrent requests in the extended frequency test (default: 5)")
+    parser.add_argument("--no-reuse", action="store_true",
+                        help="Use a dedicated connection instead of the shared one")
 
     args = parser.parse_args()
 
-    print("Starting Deriv API connectivity test...")
-    print("===============================================")
-    print(f"Mode: {args.mode.upper()}")
+    logger.info("Starting Deriv API connectivity test in %s mode", args.mode.upper())
+
+    async def run():
+        try:
+            await test_api_connectivity(
+                test_mode=args.mode,
+                verbose=args.verbose,
+                extended_test=args.extended,
+                max_concurrent_requests=args.max_concurrent,
+                reuse_connector=not args.no_reuse
+            )
+        finally:
+            await close_shared_connector()
+
+    # Prefer the libuv-based loop when it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
 
-    asyncio.run(test_api_connectivity(
-        test_mode=args.mode,
-        verbose=args.verbose,
-        extended_test=args.extended
-    ))
+    asyncio.run(run())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
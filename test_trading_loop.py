@@ -1,100 +1,171 @@
 """
 Test script for simulating the trading loop without executing real trades
+
+Feature set, confidence threshold and iteration count are command line
+options, so variants of the simulation share one script:
+
+    python test_trading_loop.py --features basic --confidence 0.7 --iterations 20
 """
 import asyncio
+import argparse
+import importlib
+import itertools
 import pandas as pd
 import os
-from datetime import datetime
+import random
+import time
+from collections import OrderedDict
 from deriv_bot.data.deriv_connector import DerivConnector
+from deriv_bot.data.connector_pool import get_shared_connector, close_shared_connector
 from deriv_bot.data.data_fetcher import DataFetcher
 from deriv_bot.data.data_processor import DataProcessor
-from deriv_bot.strategy.model_trainer import ModelTrainer
-from deriv_bot.strategy.model_predictor import ModelPredictor
+from deriv_bot.data.candle_cache import FileCache
 from deriv_bot.strategy.feature_engineering import FeatureEngineer
 from deriv_bot.risk.risk_manager import RiskManager
 from deriv_bot.monitor.performance import PerformanceTracker
-from deriv_bot.monitor.logger import setup_logger
+from deriv_bot.monitor.logger import setup_queued_logger
 from deriv_bot.utils.model_manager import ModelManager
 
-logger = setup_logger('trading_simulation')
+# Must be set before TensorFlow is imported by the strategy modules
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+
+logger = setup_queued_logger('trading_simulation')
 
 class MockOrderExecutor:
     """Mock order executor for simulation"""
+    def __init__(self):
+        self._order_ids = itertools.count(1)
+
     async def place_order(self, symbol, contract_type, amount, duration, stop_loss_pct=None):
         """Simulate order placement with stop loss"""
         logger.info(f"SIMULATION: Would place {contract_type} order for {symbol}, "
                    f"amount: {amount}, stop_loss: {stop_loss_pct}%")
+        # A counter keeps IDs unique even for orders placed within the same second
+        n = next(self._order_ids)
         return {
-            'contract_id': 'mock_id_' + datetime.now().strftime('%H%M%S'),
-            'transaction_id': 'mock_tx_' + datetime.now().strftime('%H%M%S'),
+            'contract_id': f'mock_id_{n:08d}',
+            'transaction_id': f'mock_tx_{n:08d}',
             'entry_tick': 0,
-            'entry_tick_time': datetime.now().timestamp()
+            'entry_tick_time': time.time()
         }
 
-async def run_trading_simulation():
-    """Run trading simulation with real data but mock order execution"""
+async def run_trading_simulation(reuse_connector=True, features='full', confidence_threshold=0.6,
+                                 max_iterations=10):
+    """
+    Run trading simulation with real data but mock order execution
+
+    Args:
+        reuse_connector: Use the shared connector and leave it open for the caller
+        features: 'full' adds FeatureEngineer indicators on top of the processor's
+            basic ones; 'basic' uses the processor's indicators only
+        confidence_threshold: Minimum prediction confidence to trade
+        max_iterations: Number of predictions to run
+    """
     connector = None
+    next_fetch = None
+    training = None
+    pending_trades = {}  # Settlement tasks keyed by entry timestamp
+    tf_ready = None
     try:
+        # Import TensorFlow (via the strategy modules) in a worker thread while the
+        # connection handshake and data fetch are in flight
+        tf_ready = asyncio.gather(
+            asyncio.to_thread(importlib.import_module, 'deriv_bot.strategy.model_trainer'),
+            asyncio.to_thread(importlib.import_module, 'deriv_bot.strategy.model_predictor')
+        )
+
+        # Connect to API first so the components share the established connection
+        if reuse_connector:
+            connector = await get_shared_connector()
+        else:
+            connector = DerivConnector()
+            if not await connector.connect():
+                connector = None
+        if connector is None:
+            logger.error("Failed to connect to Deriv API")
+            return
+
+        logger.info("Connected to Deriv API")
+
         # Initialize components with DEMO profile
-        connector = DerivConnector()
         data_fetcher = DataFetcher(connector)
         data_processor = DataProcessor()
-        feature_engineer = FeatureEngineer()
+        feature_engineer = FeatureEngineer() if features == 'full' else None
         risk_manager = RiskManager(is_demo=True, max_position_size=200, max_daily_loss=150)
         mock_executor = MockOrderExecutor()
         performance_tracker = PerformanceTracker()
         model_manager = ModelManager()  # Initialize model manager for proper model handling
+        candle_cache = FileCache()  # Disk cache so reruns skip repeat API fetches
 
         # Log risk profile
         risk_profile = risk_manager.get_risk_profile()
         logger.info("=== DEMO Trading Simulation Configuration ===")
         logger.info(f"Risk Profile: {risk_profile}")
         logger.info("Trading Parameters:")
-        logger.info("- Confidence Threshold: 0.6 (DEMO)")
+        logger.info(f"- Feature Set: {features}")
+        logger.info(f"- Confidence Threshold: {confidence_threshold}")
+        logger.info(f"- Iterations: {max_iterations}")
         logger.info("- Position Size: 20.0 (Higher for DEMO)")
         logger.info("- Trade Duration: 30s (Faster for DEMO)")
         logger.info("- Stop Loss: 5.0% (Wider for DEMO)")
         logger.info("==========================================")
 
-        # Connect to API
-        connected = await connector.connect()
-        if not connected:
-            logger.error("Failed to connect to Deriv API")
-            return
-
-        logger.info("Connected to Deriv API")
-
         # Test with EUR/USD
         symbol = "frxEURUSD"
 
-        # Fetch historical data
-        logger.info(f"Fetching historical data for {symbol}")
-        historical_data = await data_fetcher.fetch_historical_data(
-            symbol,
-            interval=60,
-            count=500
+        # Fetch historical data and subscribe to ticks concurrently
+        logger.info(f"Fetching historical data and subscribing to ticks for {symbol}")
+        historical_data, tick_response = await asyncio.gather(
+            candle_cache.get_or_fetch(
+                data_fetcher.fetch_historical_data,
+                symbol,
+                interval=60,
+                count=500,
+                ttl=24 * 3600  # Training data can be reused for a day
+            ),
+            data_fetcher.subscribe_to_ticks(symbol)
         )
 
         if historical_data is None:
             logger.error("Failed to fetch historical data")
             return
 
+        if tick_response is None:
+            logger.warning("Tick subscription failed, settlement prices will be polled from history")
+
         logger.info(f"Successfully fetched {len(historical_data)} candles")
 
         # Add enhanced features
-        historical_data = feature_engineer.calculate_features(historical_data)
-        if historical_data is None:
-            logger.error("Failed to calculate features")
-            return
-
-        logger.info(f"Calculated features. Shape: {historical_data.shape}")
-        logger.info(f"Features: {historical_data.columns.tolist()}")
+        if feature_engineer is not None:
+            historical_data = feature_engineer.calculate_features(historical_data)
+            if historical_data is None:
+                logger.error("Failed to calculate features")
+                return
+
+            logger.info(f"Calculated features. Shape: {historical_data.shape}")
+            logger.info(f"Features: {historical_data.columns.tolist()}")
+
+        def fetch_window():
+            """Fetch the latest simulation window, reusing data from the current candle"""
+            return candle_cache.get_or_fetch(
+                data_fetcher.fetch_historical_data,
+                symbol,
+                interval=60,
+                count=200,
+                ttl=60
+            )
+
+        # Subscribe to live candles while data is processed and the model trains;
+        # the subscription bootstraps the first simulation window
+        next_fetch = asyncio.create_task(data_fetcher.subscribe_candles(symbol, interval=60, count=200))
 
         # Process data with shorter sequence length for demo
         sequence_length = 30
         logger.info(f"Processing data with sequence length: {sequence_length}")
 
-        processed_data = data_processor.prepare_data(
+        # CPU-bound work runs in a worker thread so the event loop keeps the connection alive
+        processed_data = await asyncio.to_thread(
+            data_processor.prepare_data,
             df=historical_data,
             sequence_length=sequence_length
         )
@@ -110,201 +181,374 @@ async def run_trading_simulation():
 
         logger.info(f"Processed data shapes - X: {X.shape}, y: {y.shape}")
 
-        # Train ensemble model
-        logger.info("Training ensemble models")
-        model_trainer = ModelTrainer(input_shape=(X.shape[1], X.shape[2]))
-
         # Set model type for this test
         model_type = "short_term"
-        logger.info(f"Training {model_type} model for simulation")
-
-        history = model_trainer.train(X, y, epochs=10, model_type=model_type)  # Quick training for testing
-
-        if not history:
-            logger.error("Model training failed")
-            return
-
-        logger.info("Model training completed")
 
         # Create models directory if it doesn't exist
         models_dir = 'models'
         os.makedirs(models_dir, exist_ok=True)
-
-        # Save model with native Keras format and model type
-        model_path = os.path.join(models_dir, f'{model_type}_model.keras')
-        saved = model_trainer.save_model(model_path, scaler=scaler)
-
-        if not saved:
-            logger.error(f"Failed to save model to {model_path}")
-            return
-
-        logger.info(f"Model successfully saved to {model_path}")
-
-        # Save a timestamped model version using model manager
-        timestamp_path = model_manager.save_model_with_timestamp(
-            model_trainer.model, 
-            base_name="trained_model", 
-            model_type=model_type,
-            scaler=scaler
-        )
-
-        if timestamp_path:
-            logger.info(f"Timestamped model saved to {timestamp_path}")
-        else:
-            logger.warning("Failed to save timestamped model")
-
-        # Initialize predictor with trained model
-        predictor = ModelPredictor(model_path)
-
-        if not predictor.models:
-            logger.error("Failed to load models for prediction")
-            return
-
-        logger.info(f"Successfully loaded {len(predictor.models)} model(s) for prediction")
+        # Basic-feature models are saved separately so a warm start never mixes feature sets
+        model_name = f'{model_type}_model' if features == 'full' else f'{model_type}_{features}_model'
+        model_path = os.path.join(models_dir, f'{model_name}.keras')
+
+        model_trainer_module, model_predictor_module = await tf_ready
+
+        async def load_predictor():
+            """Load the saved model and prepare it for live inference"""
+            loaded = await asyncio.to_thread(model_predictor_module.ModelPredictor, model_path)
+            if not loaded.models:
+                return None
+
+            # Serve the live loop from float16 TFLite interpreters, then run the first
+            # inference now rather than on the first live prediction
+            await asyncio.to_thread(loaded.enable_lite_inference)
+            await asyncio.to_thread(loaded.warmup)
+            return loaded
+
+        async def train_model():
+            """Train, save and load this run's model"""
+            logger.info("Training ensemble models")
+            model_trainer = model_trainer_module.ModelTrainer(input_shape=(X.shape[1], X.shape[2]))
+            logger.info(f"Training {model_type} model for simulation")
+
+            # Identical data from an earlier run (e.g. a cached history) reuses that run's model
+            history = await asyncio.to_thread(
+                model_trainer.train_or_load, X, y, epochs=10, model_type=model_type  # Quick training for testing
+            )
+
+            if not history:
+                logger.error("Model training failed")
+                return None
+
+            logger.info("Model training completed")
+
+            # Save model with native Keras format and model type
+            saved = model_trainer.save_model(model_path, scaler=scaler)
+
+            if not saved:
+                logger.error(f"Failed to save model to {model_path}")
+                return None
+
+            logger.info(f"Model successfully saved to {model_path}")
+
+            # Save a timestamped model version using model manager
+            timestamp_path = model_manager.save_model_with_timestamp(
+                model_trainer.model,
+                base_name="trained_model",
+                model_type=model_type,
+                scaler=scaler
+            )
+
+            if timestamp_path:
+                logger.info(f"Timestamped model saved to {timestamp_path}")
+            else:
+                logger.warning("Failed to save timestamped model")
+
+            # Initialize predictor with trained model
+            trained = await load_predictor()
+            if trained is None:
+                logger.error("Failed to load models for prediction")
+                return None
+
+            logger.info(f"Successfully loaded {len(trained.models)} model(s) for prediction")
+            return trained
+
+        # A model saved by a run in the last day starts the loop right away while
+        # this run's model trains in the background; otherwise wait for training
+        predictor = None
+        if os.path.exists(model_path) and time.time() - os.path.getmtime(model_path) < 24 * 3600:
+            predictor = await load_predictor()
+            if predictor is not None and tuple(predictor.model.input_shape[1:]) != X.shape[1:]:
+                logger.info("Saved model does not match the current input shape, waiting for training")
+                predictor = None
+            elif predictor is not None:
+                logger.info(f"Starting from saved model {model_path} while training continues in the background")
+
+        training = asyncio.create_task(train_model())
+        if predictor is None:
+            predictor = await training
+            if predictor is None:
+                return
 
         # Run simulation loop with DEMO confidence threshold
         logger.info("Starting trading simulation loop")
         iteration = 0
         trades_executed = 0
         successful_trades = 0
-        confidence_threshold = 0.6  # Lower threshold for DEMO
-
-        while iteration < 10:  # Run 10 iterations for testing
-            try:
-                logger.info(f"\n=== Iteration {iteration + 1}/10 ===")
-                logger.info(f"Current Stats - Trades: {trades_executed}, Successful: {successful_trades}")
-
-                # Get latest data
-                latest_data = await data_fetcher.fetch_historical_data(
-                    symbol,
-                    interval=60,
-                    count=200
-                )
+        consecutive_failures = 0
+
+        def retry_delay():
+            """Exponential backoff with jitter: ~1s, 2s, 4s ... capped at 60s, scaled by 0.5-1.5"""
+            return min(2 ** consecutive_failures, 60) * (0.5 + random.random())
+
+        # The loop runs as a pipeline: fetching, preprocessing and prediction are
+        # separate coroutines joined by bounded queues, so the network wait for
+        # the next window overlaps feature work and inference on the current one
+        raw_queue = asyncio.Queue(maxsize=2)
+        feature_queue = asyncio.Queue(maxsize=2)
+        predictions_done = asyncio.Event()
+
+        # Trades settle on market updates rather than a fixed sleep: the fetch stage
+        # resolves each trade's future with the first price at or after its exit time
+        settlement_seconds = 60
+        settlement_grace = 5  # Live prices arrive every second or two; silence past this means no stream
+        settlements = []  # (exit epoch, future resolved with the settlement price)
+
+        def resolve_settlements(epoch, price):
+            """Settle open trades whose exit time the market has reached"""
+            for exit_epoch, settlement in settlements:
+                if epoch >= exit_epoch and not settlement.done():
+                    settlement.set_result(float(price))
+
+        async def fetch_stage(pending):
+            """Produce candle windows from the live subscription, polling history without one"""
+            nonlocal consecutive_failures
+            live = False
+            while True:
+                try:
+                    if pending is not None:
+                        latest_data = await pending
+                        pending = None
+                        live = latest_data is not None
+                        if not live:
+                            logger.warning("Candle subscription failed, polling history instead")
+                            latest_data = await fetch_window()
+                    elif live:
+                        # Waits for the next candle update instead of refetching the window
+                        latest_data = await data_fetcher.get_live_candles(symbol, interval=60, timeout=30)
+                        if latest_data is None:
+                            latest_data = await fetch_window()
+                    else:
+                        latest_data = await fetch_window()
+                except Exception as e:
+                    logger.error(f"Error fetching latest data: {str(e)}")
+                    latest_data = None
 
                 if latest_data is None:
                     logger.warning("Failed to fetch latest data, retrying...")
-                    await asyncio.sleep(5)
-                    continue
-
-                # Calculate features
-                latest_data = feature_engineer.calculate_features(latest_data)
-                if latest_data is None:
-                    logger.warning("Failed to calculate features, retrying...")
-                    await asyncio.sleep(5)
+                    await asyncio.sleep(retry_delay())
+                    consecutive_failures += 1
                     continue
 
-                # Process data
-                processed_sequence = data_processor.prepare_data(
-                    df=latest_data,
-                    sequence_length=sequence_length
+                consecutive_failures = 0
+                if live:
+                    quote = data_fetcher.get_live_quote(symbol, interval=60)
+                    if quote is not None:
+                        resolve_settlements(*quote)
+                if not predictions_done.is_set():
+                    await raw_queue.put(latest_data)
+
+                # When polling, wake on the next market tick rather than a fixed sleep;
+                # without a tick stream, fall back to a short pause
+                if not live:
+                    tick = await connector.wait_for_tick(symbol, timeout=30) if tick_response is not None else None
+                    if tick is not None:
+                        resolve_settlements(tick['epoch'], tick['quote'])
+                    else:
+                        await asyncio.sleep(5)
+
+        async def preprocess_stage():
+            """Turn candle windows into model input sequences off the event loop"""
+            # Polled and retried windows repeat, so the sequences of recent windows
+            # (keyed on symbol, last candle, length and close) are kept in a small
+            # LRU; windows that failed are remembered too, so they are not retried
+            processed = OrderedDict()  # window key -> (close, sequence), or None if it failed
+            max_cached_windows = 8
+
+            def remember(key, item):
+                processed[key] = item
+                if len(processed) > max_cached_windows:
+                    processed.popitem(last=False)
+
+            while True:
+                latest_data = await raw_queue.get()
+                try:
+                    close = float(latest_data['close'].to_numpy()[-1])
+                    window_key = (symbol, latest_data.index[-1].value, len(latest_data), close)
+                    if window_key in processed:
+                        processed.move_to_end(window_key)
+                        if processed[window_key] is not None:
+                            await feature_queue.put(processed[window_key])
+                        continue
+
+                    if feature_engineer is not None:
+                        # Regimes are classified with the clustering fitted on the training data
+                        latest_data = await asyncio.to_thread(
+                            feature_engineer.calculate_features, latest_data, fit_regimes=False
+                        )
+                        if latest_data is None:
+                            logger.warning("Failed to calculate features, skipping window")
+                            remember(window_key, None)
+                            continue
+
+                    # Build only the trailing sequence needed for prediction
+                    sequence = await asyncio.to_thread(
+                        data_processor.prepare_latest_sequence,
+                        df=latest_data,
+                        sequence_length=sequence_length
+                    )
+                    if sequence is None:
+                        logger.warning("Failed to process latest data, skipping window")
+                        remember(window_key, None)
+                        continue
+
+                    remember(window_key, (close, sequence))
+                    await feature_queue.put(processed[window_key])
+                except Exception as e:
+                    logger.error(f"Error preprocessing latest data: {str(e)}")
+
+        async def settle_trade(entry_time, contract_type, amount, current_price, predicted_return, confidence):
+            """Wait for the market to reach the exit time and score the trade"""
+            nonlocal trades_executed, successful_trades
+
+            settlement = asyncio.get_running_loop().create_future()
+            entry = (int(entry_time) + settlement_seconds, settlement)
+            settlements.append(entry)
+            try:
+                next_price = await asyncio.wait_for(settlement, timeout=settlement_seconds + settlement_grace)
+            except asyncio.TimeoutError:
+                logger.warning("No market update reached the trade exit time, polling history")
+                next_price = None
+            finally:
+                settlements.remove(entry)
+
+            if next_price is None:
+                next_data = await data_fetcher.fetch_historical_data(
+                    symbol,
+                    interval=60,
+                    count=1
                 )
-
-                if processed_sequence is None:
-                    logger.warning("Failed to process latest data, retrying...")
-                    await asyncio.sleep(5)
-                    continue
-
-                X_latest, _, _ = processed_sequence
-                if X_latest is None or len(X_latest) == 0:
-                    logger.warning("Invalid sequence data, retrying...")
-                    await asyncio.sleep(5)
-                    continue
-
-                # Get the last sequence for prediction
-                sequence = X_latest[-1:]
-                prediction_result = predictor.predict(sequence, confidence_threshold)
-
-                if prediction_result is not None:
-                    prediction = prediction_result['prediction']
-                    confidence = prediction_result['confidence']
-                    logger.info(f"Prediction value: {prediction:.4%} (confidence: {confidence:.2f})")
-
-                    current_price = latest_data['close'].iloc[-1]
-                    predicted_return = prediction  # Already in percentage form
-                    logger.info(f"Current price: {current_price:.5f}")
-                    logger.info(f"Predicted return: {predicted_return:.2%}")
-
-                    # Get prediction metrics
-                    metrics = predictor.get_prediction_metrics(sequence)
-                    logger.info(f"Prediction metrics: {metrics}")
-
-                    # Simulate trade execution if prediction is significant
-                    amount = 20.0  # Higher amount for DEMO
-                    if abs(predicted_return) >= 0.0005:  # 0.05% minimum move for Forex
-                        if risk_manager.validate_trade(symbol, amount, predicted_return):
-                            contract_type = 'CALL' if predicted_return > 0 else 'PUT'
-                            logger.info(f"Placing {contract_type} order, predicted return: {predicted_return:.2%}")
-
-                            result = await mock_executor.place_order(
-                                symbol,
-                                contract_type,
-                                amount,
-                                30,  # Shorter duration for DEMO
-                                stop_loss_pct=5.0  # Wider stop loss for DEMO
-                            )
-
-                            if result:
-                                # Wait for contract duration
-                                await asyncio.sleep(60)
-
-                                # Fetch latest price
-                                next_data = await data_fetcher.fetch_historical_data(
+                if next_data is not None:
+                    next_price = float(next_data['close'].to_numpy()[-1])
+
+            if next_price is None:
+                logger.error("Failed to fetch next price after trade")
+                return
+
+            trades_executed += 1
+            actual_return = (next_price - current_price) / current_price
+
+            # Determine if trade was successful
+            if (contract_type == 'CALL' and actual_return > 0) or \
+               (contract_type == 'PUT' and actual_return < 0):
+                successful_trades += 1
+                logger.info(f"Successful trade! Price moved {actual_return:.2%}")
+            else:
+                logger.info(f"Unsuccessful trade. Price moved {actual_return:.2%}")
+
+            # Record trade for performance tracking
+            trade_data = {
+                'symbol': symbol,
+                'type': contract_type,
+                'amount': amount,
+                'entry_price': current_price,
+                'exit_price': next_price,
+                'predicted_change': predicted_return,
+                'actual_change': actual_return,
+                'confidence': confidence,
+                'timestamp_ns': time.time_ns()
+            }
+            performance_tracker.add_trade(trade_data)
+
+            # Log detailed trade performance
+            logger.info("\n=== Trade Performance Update ===")
+            logger.info(f"Win Rate: {(successful_trades/trades_executed)*100:.1f}%")
+            logger.info(f"Prediction Accuracy: {abs(predicted_return - actual_return):.2%}")
+            stats = performance_tracker.get_statistics()
+            if stats:
+                logger.info(f"Performance Stats: {stats}")
+
+        async def predict_stage():
+            """Predict on each sequence and open simulated trades"""
+            nonlocal iteration
+            while iteration < max_iterations:
+                current_price, sequence = await feature_queue.get()
+                try:
+                    logger.info(f"\n=== Iteration {iteration + 1}/{max_iterations} ===")
+                    logger.info(f"Current Stats - Trades: {trades_executed}, Successful: {successful_trades}")
+
+                    # Run inference in a worker thread so the fetch stage keeps progressing
+                    prediction_result = await asyncio.to_thread(predictor.predict, sequence, confidence_threshold)
+
+                    if prediction_result is not None:
+                        prediction = prediction_result['prediction']
+                        confidence = prediction_result['confidence']
+                        logger.info(f"Prediction value: {prediction:.4%} (confidence: {confidence:.2f})")
+
+                        predicted_return = prediction  # Already in percentage form
+                        logger.info(f"Current price: {current_price:.5f}")
+                        logger.info(f"Predicted return: {predicted_return:.2%}")
+
+                        # Metrics come with the prediction, so the models are not run a second time
+                        logger.info(f"Prediction metrics - Spread: {prediction_result['prediction_spread']:.4%}, "
+                                    f"Magnitude: {prediction_result['prediction_magnitude']:.4%}, "
+                                    f"Models: {prediction_result['model_predictions']}")
+
+                        # Simulate trade execution if prediction is significant
+                        amount = 20.0  # Higher amount for DEMO
+                        if abs(predicted_return) >= 0.0005:  # 0.05% minimum move for Forex
+                            if risk_manager.validate_trade(symbol, amount, predicted_return):
+                                contract_type = 'CALL' if predicted_return > 0 else 'PUT'
+                                logger.info(f"Placing {contract_type} order, predicted return: {predicted_return:.2%}")
+
+                                result = await mock_executor.place_order(
                                     symbol,
-                                    interval=60,
-                                    count=1
+                                    contract_type,
+                                    amount,
+                                    30,  # Shorter duration for DEMO
+                                    stop_loss_pct=5.0  # Wider stop loss for DEMO
                                 )
 
-                                if next_data is not None:
-                                    trades_executed += 1
-                                    next_price = next_data['close'].iloc[-1]
-                                    actual_return = (next_price - current_price) / current_price
-
-                                    # Determine if trade was successful
-                                    if (contract_type == 'CALL' and actual_return > 0) or \
-                                       (contract_type == 'PUT' and actual_return < 0):
-                                        successful_trades += 1
-                                        logger.info(f"Successful trade! Price moved {actual_return:.2%}")
-                                    else:
-                                        logger.info(f"Unsuccessful trade. Price moved {actual_return:.2%}")
-
-                                    # Record trade for performance tracking
-                                    trade_data = {
-                                        'symbol': symbol,
-                                        'type': contract_type,
-                                        'amount': amount,
-                                        'entry_price': current_price,
-                                        'exit_price': next_price,
-                                        'predicted_change': predicted_return,
-                                        'actual_change': actual_return,
-                                        'confidence': confidence,
-                                        'timestamp': datetime.now().isoformat()
-                                    }
-                                    performance_tracker.add_trade(trade_data)
-
-                                    # Log detailed trade performance
-                                    logger.info("\n=== Trade Performance Update ===")
-                                    logger.info(f"Win Rate: {(successful_trades/trades_executed)*100:.1f}%")
-                                    logger.info(f"Prediction Accuracy: {abs(predicted_return - actual_return):.2%}")
-                                    stats = performance_tracker.get_statistics()
-                                    if stats:
-                                        logger.info(f"Performance Stats: {stats}")
-                                else:
-                                    logger.error("Failed to fetch next price after trade")
-
+                                if result:
+                                    entry_time = result['entry_tick_time']
+                                    pending_trades[entry_time] = asyncio.create_task(settle_trade(
+                                        entry_time, contract_type, amount, current_price, predicted_return, confidence
+                                    ))
+                        else:
+                            logger.info(f"No trade: predicted move ({predicted_return:.2%}) below threshold")
                     else:
-                        logger.info(f"No trade: predicted move ({predicted_return:.2%}) below threshold")
-                else:
-                    logger.info("No trade: prediction confidence below threshold")
-
-                iteration += 1
-                logger.info(f"Completed simulation iteration {iteration}/10")
-
-                # Wait before next iteration
-                await asyncio.sleep(5)  # Shorter wait for testing
-
-            except Exception as e:
-                logger.error(f"Error in simulation loop: {str(e)}")
-                await asyncio.sleep(5)
+                        logger.info("No trade: prediction confidence below threshold")
+
+                    iteration += 1
+                    logger.info(f"Completed simulation iteration {iteration}/{max_iterations}")
+
+                except Exception as e:
+                    logger.error(f"Error in simulation loop: {str(e)}")
+
+        async def swap_in_trained_model():
+            """Replace the saved model with this run's model once training finishes"""
+            nonlocal predictor
+            trained = await training
+            if trained is not None:
+                predictor = trained  # Later predictions pick up the new predictor
+                logger.info("Switched simulation to the newly trained model")
+
+        pipeline = [asyncio.create_task(fetch_stage(next_fetch)), asyncio.create_task(preprocess_stage())]
+        next_fetch = None  # Now owned by the fetch stage
+        if not training.done():
+            pipeline.append(asyncio.create_task(swap_in_trained_model()))
+        try:
+            await predict_stage()
+
+            # Stop feeding windows but keep the fetch stage running, since its
+            # market updates settle the trades still open
+            predictions_done.set()
+            pipeline[1].cancel()
+            while not raw_queue.empty():
+                raw_queue.get_nowait()  # Releases a fetch stage blocked on a full queue
+
+            if pending_trades:
+                logger.info(f"Waiting for {len(pending_trades)} open trade(s) to settle")
+                await asyncio.gather(*pending_trades.values(), return_exceptions=True)
+
+            # Let background training finish so this run's model is saved
+            if not training.done():
+                logger.info("Waiting for background training to finish")
+                await asyncio.gather(training, return_exceptions=True)
+        finally:
+            for task in pipeline:
+                task.cancel()
+            await asyncio.gather(*pipeline, return_exceptions=True)
 
         # Final performance report
         logger.info("\n=== Final Simulation Report ===")
@@ -321,8 +565,9 @@ async def run_trading_simulation():
                     logger.info(f"{key}: {value}")
 
             # Export results
-            performance_tracker.export_history('simulation_results.csv')
-            logger.info("\nSimulation results exported to simulation_results.csv")
+            exported = performance_tracker.export_history('simulation_results.parquet')
+            if exported:
+                logger.info(f"\nSimulation results exported to {exported}")
         else:
             logger.warning("No trades executed during simulation")
 
@@ -335,10 +580,52 @@ async def run_trading_simulation():
     except Exception as e:
         logger.error(f"Fatal error in simulation: {str(e)}")
     finally:
-        if connector:
+        # Early returns skip the await on the imports; retrieve their outcome here
+        # so a failed import is not reported as a never-retrieved exception
+        if tf_ready is not None:
+            if not tf_ready.done():
+                tf_ready.cancel()
+            await asyncio.gather(tf_ready, return_exceptions=True)
+        if next_fetch is not None and not next_fetch.done():
+            next_fetch.cancel()
+        if training is not None and not training.done():
+            training.cancel()
+        for task in pending_trades.values():
+            task.cancel()
+        if connector and not reuse_connector:
             await connector.close()
 
+async def main(reuse_connector=True, **options):
+    """Run the simulation and close the shared connector afterwards"""
+    try:
+        await run_trading_simulation(reuse_connector=reuse_connector, **options)
+    finally:
+        await close_shared_connector()
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate the trading loop with mock order execution")
+    parser.add_argument("--no-reuse", action="store_true",
+                        help="Use a dedicated connection instead of the shared one")
+    parser.add_argument("--features", choices=["basic", "full"], default="full",
+                        help="Feature set: processor indicators only, or with FeatureEngineer indicators")
+    parser.add_argument("--confidence", type=float, default=0.6,
+                        help="Minimum prediction confidence to trade (default: 0.6 for DEMO)")
+    parser.add_argument("--iterations", type=int, default=10,
+                        help="Number of prediction iterations to run")
+    args = parser.parse_args()
+
+    # Prefer the libuv-based loop when it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     print("Starting trading simulation...")
     print("=" * 30)
-    asyncio.run(run_trading_simulation())
\ No newline at end of file
+    asyncio.run(main(
+        reuse_connector=not args.no_reuse,
+        features=args.features,
+        confidence_threshold=args.confidence,
+        max_iterations=args.iterations
+    ))
\ No newline at end of file
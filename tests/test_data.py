@@ -22,23 +22,29 @@ Author: Trading Bot Team
 Last modified: 2024-02-26
 """
 import unittest
+import asyncio
+import shutil
+import tempfile
 import pandas as pd
 import numpy as np
 from deriv_bot.data.data_processor import DataProcessor
+from deriv_bot.data.candle_cache import FileCache
+from deriv_bot.data.candle_buffer import CandleBuffer
 
 class TestDataProcessor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Create sample data once; each test works on its own copy
+        dates = pd.date_range(start='2023-01-01', periods=100, freq='H')
+        cls.base_data = pd.DataFrame(
+            np.random.default_rng(0).random((100, 5)),  # Seeded so failures reproduce
+            columns=['open', 'high', 'low', 'close', 'volume'],
+            index=dates
+        )
+
     def setUp(self):
         self.processor = DataProcessor()
-        
-        # Create sample data
-        dates = pd.date_range(start='2023-01-01', periods=100, freq='H')
-        self.sample_data = pd.DataFrame({
-            'open': np.random.random(100),
-            'high': np.random.random(100),
-            'low': np.random.random(100),
-            'close': np.random.random(100),
-            'volume': np.random.random(100)
-        }, index=dates)
+        self.sample_data = self.base_data.copy()  # add_technical_indicators adds columns in place
         
     def test_add_technical_indicators(self):
         """Test technical indicator calculation"""
@@ -56,7 +62,36 @@ class TestDataProcessor(unittest.TestCase):
         self.assertIsNotNone(y)
         self.assertIsNotNone(scaler)
         self.assertEqual(len(X.shape), 3)  # (samples, sequence_length, features)
+        self.assertEqual(X.dtype, np.float32)  # Matches the model's input signature
         
+    def test_prepare_data_reuses_result(self):
+        """Test repeated preparation of an unchanged window is memoized"""
+        columns = self.sample_data.columns.tolist()
+        first = self.processor.prepare_data(self.sample_data, sequence_length=10)
+        second = self.processor.prepare_data(self.sample_data, sequence_length=10)
+
+        np.testing.assert_array_equal(first[0], second[0])
+        self.assertIsNot(first[0], second[0])  # Each caller gets its own arrays
+        self.assertEqual(self.sample_data.columns.tolist(), columns)  # Input left untouched
+
+        X, y, scaler = self.processor.prepare_data(self.sample_data, sequence_length=10, scaler=first[2])
+        self.assertIs(scaler, first[2])
+        np.testing.assert_allclose(y, first[1])
+
+        # A revised interior candle with the same endpoints is not served from the memo
+        revised = self.sample_data.copy()
+        revised.iloc[50, revised.columns.get_loc('close')] += 1.0
+        X_revised, _, _ = self.processor.prepare_data(revised, sequence_length=10)
+        self.assertFalse(np.array_equal(X_revised, first[0]))
+
+    def test_prepare_latest_sequence(self):
+        """Test building only the trailing sequence for prediction"""
+        X = self.processor.prepare_latest_sequence(self.sample_data, sequence_length=10)
+
+        self.assertEqual(X.shape, (1, 10, self.processor.default_feature_dim))
+        self.assertEqual(X.dtype, np.float32)
+        pd.testing.assert_frame_equal(self.sample_data, self.base_data)  # Input left untouched
+
     def test_create_sequences(self):
         """Test sequence creation"""
         data = np.random.random((100, 5))
@@ -65,5 +100,60 @@ class TestDataProcessor(unittest.TestCase):
         self.assertEqual(X.shape[1], 10)  # sequence length
         self.assertEqual(len(y.shape), 1)  # 1D array of targets
 
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix="test_candle_cache_")
+        self.cache = FileCache(cache_dir=self.cache_dir)
+        dates = pd.date_range(start='2023-01-01', periods=10, freq='min')
+        self.sample_data = pd.DataFrame({'close': np.arange(10, dtype=float)}, index=dates)
+        self.fetch_calls = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    async def _fetch(self, symbol, interval, count):
+        self.fetch_calls += 1
+        return self.sample_data
+
+    def test_get_or_fetch_caches_result(self):
+        """Test second lookup within TTL is served from disk"""
+        for _ in range(2):
+            df = asyncio.run(self.cache.get_or_fetch(self._fetch, "frxEURUSD", 60, 10, ttl=3600))
+            pd.testing.assert_frame_equal(df, self.sample_data)
+
+        self.assertEqual(self.fetch_calls, 1)
+
+    def test_zero_ttl_misses(self):
+        """Test expired entries are not returned"""
+        self.cache.put("frxEURUSD", 60, 10, self.sample_data)
+        self.assertIsNone(self.cache.get("frxEURUSD", 60, 10, ttl=0))
+
+class TestCandleBuffer(unittest.TestCase):
+    def setUp(self):
+        dates = pd.date_range(start='2023-01-01', periods=5, freq='min')
+        prices = np.arange(5, dtype=np.float32)
+        self.sample_data = pd.DataFrame(
+            {'open': prices, 'high': prices, 'low': prices, 'close': prices},
+            index=dates
+        )
+        self.buffer = CandleBuffer.from_dataframe(self.sample_data)
+
+    def test_update_forming_candle_in_place(self):
+        """Test an update for the newest candle overwrites it"""
+        self.buffer.update(self.buffer.last_epoch, 4.0, 9.0, 4.0, 8.0)
+
+        self.assertEqual(len(self.buffer), 5)
+        self.assertEqual(self.buffer.last_close, 8.0)
+
+    def test_new_candle_replaces_oldest(self):
+        """Test a new candle wraps around and the frame stays chronological"""
+        self.buffer.update(self.buffer.last_epoch + 60, 5.0, 5.0, 5.0, 5.0)
+        df = self.buffer.to_dataframe()
+
+        self.assertEqual(len(df), 5)
+        self.assertEqual(df['close'].tolist(), [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertEqual(df['close'].dtype, np.float32)
+
 if __name__ == '__main__':
     unittest.main()
@@ -33,9 +33,14 @@ from deriv_bot.monitor.logger import setup_logger
 logger = setup_logger("test_strategy")
 
 class TestStrategy(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Building the Keras model is the slow part of setup, so it is shared;
+        # tests only train it further or read it, never rely on its weights
+        cls.input_shape = (60, 8)  # (sequence_length, features)
+        cls.trainer = ModelTrainer(cls.input_shape)
+
     def setUp(self):
-        self.input_shape = (60, 8)  # (sequence_length, features)
-        self.trainer = ModelTrainer(self.input_shape)
         # Create a temporary directory for test models
         self.test_model_dir = tempfile.mkdtemp(prefix="test_models_")
         # Create a model manager for testing
@@ -177,6 +182,21 @@ class TestStrategy(unittest.TestCase):
             self.assertIn('prediction', prediction)
             self.assertIn('confidence', prediction)
 
+    def test_model_manager_model_info(self):
+        """Test model manager caches path and modification time of saved models"""
+        model_type = "info_type"
+        self.assertIsNone(self.model_manager.model_info(model_type))
+
+        save_path = self.model_manager.save_model_with_timestamp(
+            self.trainer.model,
+            base_name="test_model",
+            model_type=model_type
+        )
+
+        info = self.model_manager.model_info(model_type)
+        self.assertIsNotNone(info, "Model info not cached after save")
+        self.assertEqual(info[0], save_path)
+
     def test_model_prediction(self):
         """Test model prediction"""
         predictor = ModelPredictor()